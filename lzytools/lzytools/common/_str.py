@@ -1,8 +1,18 @@
+import os
 import random
 import string
+import threading
+from typing import Union, List
 
 import unicodedata
 
+# 全角/半角字符转换表（首次调用时生成）
+_HALF_WIDTH_TABLE = None
+_FULL_WIDTH_TABLE = None
+_TABLE_LOCK = threading.Lock()
+
+_NUMPY = None  # 可选依赖numpy（首次使用numpy模式时导入，未安装时为False）
+
 """----------逻辑函数----------"""
 
 
@@ -15,6 +25,18 @@ def _create_random_string(length: int = 16, lowercase: bool = True, uppercase: b
     :param digits: 是否包含数字
     :param special_characters: 是否包含特殊符号
     :return: 生成的文本"""
+    characters = _get_random_characters(lowercase, uppercase, digits, special_characters)
+    if not characters:
+        return ''
+
+    random_string = ''.join(random.choices(characters, k=length))
+
+    return random_string
+
+
+def _get_random_characters(lowercase: bool = True, uppercase: bool = True, digits: bool = True,
+                           special_characters: bool = True) -> str:
+    """组合随机文本可使用的字符"""
     characters = ''
     if lowercase:
         characters += string.ascii_lowercase
@@ -24,46 +46,159 @@ def _create_random_string(length: int = 16, lowercase: bool = True, uppercase: b
         characters += string.digits
     if special_characters:
         characters += string.punctuation
-    if not characters:
-        return ''
+    return characters
 
-    random_string = ''.join(random.choices(characters, k=length))
 
-    return random_string
+def _import_numpy():
+    """导入可选依赖numpy，未安装时返回None"""
+    global _NUMPY
+    if _NUMPY is None:
+        try:
+            import numpy
+            _NUMPY = numpy
+        except ImportError:
+            _NUMPY = False
+    return _NUMPY or None
+
+
+def _create_random_text(size: int, characters: str, use_numpy: bool = False) -> str:
+    """使用os.urandom生成指定长度的随机文本（一次性读取随机字节后映射为字符）
+    丢弃超出字符数整数倍范围的字节（拒绝采样），保证每个字符出现的概率一致
+    :param size: 文本长度
+    :param characters: 可使用的字符（ASCII字符，不超过256个）
+    :param use_numpy: 是否使用numpy进行映射
+    :return: 生成的文本"""
+    characters_count = len(characters)
+    limit = 256 - 256 % characters_count  # 不小于该值的字节会导致取模偏差，直接丢弃
+
+    if use_numpy:
+        numpy = _import_numpy()
+        character_array = numpy.frombuffer(characters.encode('ascii'), dtype=numpy.uint8)
+        chunks = []
+        remain = size
+        while remain > 0:
+            data = numpy.frombuffer(os.urandom(remain * 256 // limit + 16), dtype=numpy.uint8)
+            data = data[data < limit][:remain]
+            chunks.append(character_array[data % characters_count].tobytes())
+            remain -= len(data)
+        return b''.join(chunks).decode('ascii')
+
+    # 字节→字符的转换表，丢弃的字节通过delete参数删除
+    table = bytes(ord(characters[i % characters_count]) for i in range(256))
+    delete = bytes(range(limit, 256))
+    text = bytearray()
+    while len(text) < size:
+        text += os.urandom((size - len(text)) * 256 // limit + 16).translate(table, delete)
+    return text[:size].decode('ascii')
+
+
+def _create_random_strings(count: int, length: int = 16, lowercase: bool = True, uppercase: bool = True,
+                           digits: bool = True, special_characters: bool = True,
+                           use_numpy: bool = False) -> List[str]:
+    """批量生成指定长度的随机文本，结果之间不重复
+    :param count: 生成数量
+    :param length: 文本长度
+    :param lowercase: 是否包含小写英文字母
+    :param uppercase: 是否包含大写英文字母
+    :param digits: 是否包含数字
+    :param special_characters: 是否包含特殊符号
+    :param use_numpy: 是否使用numpy批量映射随机字节（需要安装numpy）
+    :return: 生成的文本列表"""
+    if count <= 0:
+        return []
+    if use_numpy and _import_numpy() is None:
+        raise Exception('未安装numpy，无法使用numpy模式')
+
+    characters = _get_random_characters(lowercase, uppercase, digits, special_characters)
+    if not characters or len(characters) ** length < count:
+        raise Exception(f'可使用的字符不足，无法生成{count}个不重复的随机文本')
+
+    # 一次生成所有文本再切分，出现重复时只补充缺少的数量
+    random_strings = {}
+    while len(random_strings) < count:
+        need_count = count - len(random_strings)
+        text = _create_random_text(need_count * length, characters, use_numpy)
+        random_strings.update(dict.fromkeys(text[i:i + length] for i in range(0, need_count * length, length)))
+
+    return list(random_strings)
 
 
-def _convert_character_to_half_width(text: str) -> str:
-    """将传入文本中的字符转换为半角字符"""
-    # 先将字符串进行Unicode规范化为NFKC格式（兼容性组合用序列）
-    normalized_string = unicodedata.normalize('NFKC', text)
+def _get_width_tables() -> tuple:
+    """获取全角/半角字符转换表（str.translate使用）
+    :return: (全角转半角的转换表, 半角转全角的转换表)"""
+    global _HALF_WIDTH_TABLE, _FULL_WIDTH_TABLE
+    if _HALF_WIDTH_TABLE is None:
+        with _TABLE_LOCK:
+            if _HALF_WIDTH_TABLE is None:
+                # ASCII可见字符（0x21~0x7E）与全角字符（0xFF01~0xFF5E）一一对应，空格对应全角空格（0x3000）
+                half_width_table = {code_point + 0xFEE0: code_point for code_point in range(0x21, 0x7F)}
+                half_width_table[0x3000] = 0x20
+                full_width_table = {value: key for key, value in half_width_table.items()}
+                _FULL_WIDTH_TABLE = full_width_table
+                _HALF_WIDTH_TABLE = half_width_table
+    return _HALF_WIDTH_TABLE, _FULL_WIDTH_TABLE
+
+
+def _normalize_text(text: str, normalize: Union[str, None]) -> str:
+    """按指定格式规范化文本（纯ASCII文本在任何规范化格式下都不变，直接跳过）"""
+    if not normalize or text.isascii():
+        return text
+    return unicodedata.normalize(normalize, text)
+
+
+def _convert_character_to_half_width(text: str, normalize: Union[str, None] = 'NFKC') -> str:
+    """将传入文本中的字符转换为半角字符
+    :param text: 文本
+    :param normalize: Unicode规范化格式（'NFKC'、'NFKD'、'NFC'、'NFD'），为None时不进行规范化，仅转换全角字符
+    :return: 转换后的文本"""
+    # 先将字符串进行Unicode规范化（默认为NFKC格式，兼容性组合用序列）
+    text = _normalize_text(text, normalize)
+    # NFKC/NFKD兼容性规范化已将全角ASCII字符及全角空格转换为半角字符
+    if normalize in ('NFKC', 'NFKD') or text.isascii():
+        return text
 
     # 对于ASCII范围内的全角字符，将其替换为对应的半角字符
-    half_width_string = []
-    for char in normalized_string:
-        code_point = ord(char)
-        if 0xFF01 <= code_point <= 0xFF5E:
-            half_width_string.append(chr(code_point - 0xFEE0))
-        else:
-            half_width_string.append(char)
+    return text.translate(_get_width_tables()[0])
+
+
+def _convert_character_to_full_width(text: str, normalize: Union[str, None] = 'NFKC') -> str:
+    """将传入文本中的字符转换为全角字符
+    :param text: 文本
+    :param normalize: Unicode规范化格式（'NFKC'、'NFKD'、'NFC'、'NFD'），为None时不进行规范化，仅转换半角字符
+    :return: 转换后的文本"""
+    # 先将字符串进行Unicode规范化（默认为NFKC格式，兼容性组合用序列）
+    text = _normalize_text(text, normalize)
 
-    return ''.join(half_width_string)
+    # 对于ASCII范围内的字符，将其替换为对应的全角字符（空格转换为全角空格）
+    return text.translate(_get_width_tables()[1])
 
 
-def _convert_character_to_full_width(text: str) -> str:
-    """将传入文本中的字符转换为全角字符"""
-    # 将字符串进行Unicode规范化为NFKC格式（兼容性组合用序列）
-    normalized_string = unicodedata.normalize('NFKC', text)
+def _convert_file_character_width(file_path: str, output_path: str = None, to_full_width: bool = False,
+                                  normalize: Union[str, None] = 'NFKC', encoding: str = 'utf-8') -> str:
+    """逐行转换文本文件中的字符为半角/全角字符（不将整个文件读入内存）
+    :param file_path: 文本文件路径
+    :param output_path: 输出文件路径，为None时覆盖原文件
+    :param to_full_width: 是否转换为全角字符，默认转换为半角字符
+    :param normalize: Unicode规范化格式，为None时不进行规范化
+    :param encoding: 文件编码
+    :return: 输出文件路径"""
+    convert_func = _convert_character_to_full_width if to_full_width else _convert_character_to_half_width
+    output_path = output_path or file_path
+    # 先写入临时文件，完成后再替换，输出路径与原文件相同时也不会损坏原文件
+    temp_path = f'{output_path}.{_create_random_string(8, special_characters=False)}.tmp'
 
-    # 对于ASCII范围内的字符，将其替换为对应的全角字符
-    full_width_string = []
-    for char in normalized_string:
-        code_point = ord(char)
-        if 0x0020 <= code_point <= 0x007E:
-            full_width_string.append(chr(code_point + 0xFF00 - 0x0020))
-        else:
-            full_width_string.append(char)
+    try:
+        # newline=''保留原文件的换行符
+        with open(file_path, 'r', encoding=encoding, newline='') as f_in, \
+                open(temp_path, 'w', encoding=encoding, newline='') as f_out:
+            for line in f_in:
+                f_out.write(convert_func(line, normalize))
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
-    return ''.join(full_width_string)
+    return output_path
 
 
 """----------调用函数----------"""
@@ -81,21 +216,66 @@ def create_random_string(length: int = 16, lowercase: bool = True, uppercase: bo
     return _create_random_string(length, lowercase, uppercase, digits, special_characters)
 
 
-def to_half_width_character(text: str) -> str:
-    """将传入文本中的字符转换为半角字符"""
-    return _convert_character_to_half_width(text)
+def create_random_strings(count: int, length: int = 16, lowercase: bool = True, uppercase: bool = True,
+                          digits: bool = True, special_characters: bool = False,
+                          use_numpy: bool = False) -> List[str]:
+    """批量生成指定长度的随机文本，结果之间不重复（使用os.urandom）
+    :param count: 生成数量
+    :param length: 文本长度
+    :param lowercase: 是否包含小写英文字母
+    :param uppercase: 是否包含大写英文字母
+    :param digits: 是否包含数字
+    :param special_characters: 是否包含特殊符号
+    :param use_numpy: 是否使用numpy批量映射随机字节（需要安装numpy）
+    :return: 生成的文本列表"""
+    return _create_random_strings(count, length, lowercase, uppercase, digits, special_characters, use_numpy)
+
+
+def to_half_width_character(text: str, normalize: Union[str, None] = 'NFKC') -> str:
+    """将传入文本中的字符转换为半角字符
+    :param text: 文本
+    :param normalize: Unicode规范化格式，为None时不进行规范化，仅转换全角字符"""
+    return _convert_character_to_half_width(text, normalize)
+
+
+def convert_character_to_half_width(text: str, normalize: Union[str, None] = 'NFKC') -> str:
+    """将传入文本中的字符转换为半角字符
+    :param text: 文本
+    :param normalize: Unicode规范化格式，为None时不进行规范化，仅转换全角字符"""
+    return _convert_character_to_half_width(text, normalize)
+
+
+def to_full_width_character(text: str, normalize: Union[str, None] = 'NFKC') -> str:
+    """将传入文本中的字符转换为全角字符
+    :param text: 文本
+    :param normalize: Unicode规范化格式，为None时不进行规范化，仅转换半角字符"""
+    return _convert_character_to_full_width(text, normalize)
 
 
-def convert_character_to_half_width(text: str) -> str:
-    """将传入文本中的字符转换为半角字符"""
-    return _convert_character_to_half_width(text)
+def convert_character_to_full_width(text: str, normalize: Union[str, None] = 'NFKC') -> str:
+    """将传入文本中的字符转换为全角字符
+    :param text: 文本
+    :param normalize: Unicode规范化格式，为None时不进行规范化，仅转换半角字符"""
+    return _convert_character_to_full_width(text, normalize)
 
 
-def to_full_width_character(text: str) -> str:
-    """将传入文本中的字符转换为全角字符"""
-    return _convert_character_to_full_width(text)
+def convert_file_to_half_width(file_path: str, output_path: str = None, normalize: Union[str, None] = 'NFKC',
+                               encoding: str = 'utf-8') -> str:
+    """逐行将文本文件中的字符转换为半角字符（不将整个文件读入内存）
+    :param file_path: 文本文件路径
+    :param output_path: 输出文件路径，为None时覆盖原文件
+    :param normalize: Unicode规范化格式，为None时不进行规范化
+    :param encoding: 文件编码
+    :return: 输出文件路径"""
+    return _convert_file_character_width(file_path, output_path, False, normalize, encoding)
 
 
-def convert_character_to_full_width(text: str) -> str:
-    """将传入文本中的字符转换为全角字符"""
-    return _convert_character_to_full_width(text)
+def convert_file_to_full_width(file_path: str, output_path: str = None, normalize: Union[str, None] = 'NFKC',
+                               encoding: str = 'utf-8') -> str:
+    """逐行将文本文件中的字符转换为全角字符（不将整个文件读入内存）
+    :param file_path: 文本文件路径
+    :param output_path: 输出文件路径，为None时覆盖原文件
+    :param normalize: Unicode规范化格式，为None时不进行规范化
+    :param encoding: 文件编码
+    :return: 输出文件路径"""
+    return _convert_file_character_width(file_path, output_path, True, normalize, encoding)
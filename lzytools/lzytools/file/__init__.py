@@ -1,6 +1,15 @@
+from ._chunk import *
+from ._duplicate import *
 from ._filename import *
 from ._filepath import *
 from ._hash import *
+from ._hash_async import *
+from ._hash_cache import *
+from ._hash_resumable import *
 from ._info import *
+from ._live_index import *
 from ._operation import *
 from ._properties import *
+from ._scanner import *
+from ._snapshot import *
+from ._sort import *
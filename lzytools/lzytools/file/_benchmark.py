@@ -0,0 +1,155 @@
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from typing import Iterable, List, Dict
+
+from ._hash import _calc_hashes, _iter_hashes_from_files
+
+"""----------逻辑函数----------"""
+
+
+def _create_benchmark_files(work_dir: str, tiny_count: int, medium_count: int, medium_size: int,
+                            large_size: int) -> Dict[str, List[str]]:
+    """生成测试用的文件
+    :param work_dir: 生成文件的文件夹
+    :param tiny_count: 小文件（1KB）数量
+    :param medium_count: 中等文件数量
+    :param medium_size: 中等文件大小（字节）
+    :param large_size: 大文件大小（字节），使用稀疏文件生成，不实际占用磁盘空间
+    :return: {数据集名称: 文件路径列表}"""
+    datasets = {'tiny': [], 'medium': [], 'large': []}
+
+    for i in range(tiny_count):
+        file_path = os.path.join(work_dir, f'tiny_{i}.bin')
+        with open(file_path, 'wb') as f:
+            f.write(os.urandom(1024))
+        datasets['tiny'].append(file_path)
+
+    for i in range(medium_count):
+        file_path = os.path.join(work_dir, f'medium_{i}.bin')
+        with open(file_path, 'wb') as f:
+            f.write(os.urandom(medium_size))
+        datasets['medium'].append(file_path)
+
+    if large_size:
+        file_path = os.path.join(work_dir, 'large_sparse.bin')
+        with open(file_path, 'wb') as f:
+            f.write(os.urandom(1024))  # 写入少量随机数据，其余部分为稀疏空洞
+            f.truncate(large_size)
+        datasets['large'].append(file_path)
+
+    return datasets
+
+
+def _measure(file_paths: List[str], algorithm: str, block_size: int, use_mmap: bool, max_workers: int) -> dict:
+    """计算一组文件的哈希值并统计耗时
+    :param max_workers: 线程数，为1时在当前线程中逐个计算"""
+    total_bytes = sum(os.path.getsize(i) for i in file_paths)
+
+    start = time.perf_counter()
+    if max_workers == 1:
+        for file_path in file_paths:
+            _calc_hashes(file_path, algorithm, block_size, use_mmap)
+    else:
+        for _ in _iter_hashes_from_files(file_paths, algorithm, max_workers, block_size, use_mmap):
+            pass
+    seconds = time.perf_counter() - start
+
+    return {'algorithm': algorithm,
+            'block_size': block_size,
+            'mode': 'mmap' if use_mmap else 'read',
+            'threads': max_workers,
+            'files': len(file_paths),
+            'bytes': total_bytes,
+            'seconds': round(seconds, 6),
+            'mb_per_s': round(total_bytes / 1048576 / seconds, 2) if seconds else None,
+            'files_per_s': round(len(file_paths) / seconds, 2) if seconds else None}
+
+
+def _benchmark_hash(output_path: str = None, work_dir: str = None,
+                    algorithms: Iterable[str] = ('xxhash', 'md5', 'sha256'),
+                    block_sizes: Iterable[int] = (8192, 65536, 1048576),
+                    max_workers: int = None, tiny_count: int = 1000, medium_count: int = 8,
+                    medium_size: int = 16777216, large_size: int = 2147483648) -> dict:
+    """测试哈希函数的吞吐量（MB/s、文件数/s）
+    对比不同算法、读取块大小、单线程与线程池、普通读取与内存映射读取
+    :param output_path: 结果保存的json文件路径，为空时不保存
+    :param work_dir: 生成测试文件的文件夹，默认使用系统临时文件夹，测试结束后删除生成的文件
+    :param algorithms: 测试的算法列表
+    :param block_sizes: 测试的读取块大小列表
+    :param max_workers: 线程池的线程数，默认为CPU核心数+4（最多32）
+    :param tiny_count: 小文件（1KB）数量
+    :param medium_count: 中等文件数量
+    :param medium_size: 中等文件大小（字节）
+    :param large_size: 大文件大小（字节），为0时不测试大文件
+    :return: 测试结果"""
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+
+    temp_dir = tempfile.mkdtemp(prefix='lzytools_benchmark_', dir=work_dir)
+    try:
+        datasets = _create_benchmark_files(temp_dir, tiny_count, medium_count, medium_size, large_size)
+
+        results = []
+        for dataset, file_paths in datasets.items():
+            if not file_paths:
+                continue
+            for algorithm in algorithms:
+                for block_size in block_sizes:
+                    cases = [(False, 1), (True, 1), (False, max_workers)]
+                    if dataset == 'tiny':  # 小文件使用mmap没有意义
+                        cases.remove((True, 1))
+                    if dataset == 'large':  # 单个文件无法并行计算
+                        cases.remove((False, max_workers))
+                    for use_mmap, workers in cases:
+                        result = _measure(file_paths, algorithm, block_size, use_mmap, workers)
+                        result['dataset'] = dataset
+                        results.append(result)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    report = {'environment': {'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()),
+                              'python': platform.python_version(),
+                              'platform': platform.platform(),
+                              'cpu_count': os.cpu_count()},
+              'results': results}
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return report
+
+
+"""----------调用函数----------"""
+
+
+def benchmark_hash(output_path: str = None, work_dir: str = None,
+                   algorithms: Iterable[str] = ('xxhash', 'md5', 'sha256'),
+                   block_sizes: Iterable[int] = (8192, 65536, 1048576),
+                   max_workers: int = None, tiny_count: int = 1000, medium_count: int = 8,
+                   medium_size: int = 16777216, large_size: int = 2147483648) -> dict:
+    """测试哈希函数的吞吐量（MB/s、文件数/s）
+    对比不同算法、读取块大小、单线程与线程池、普通读取与内存映射读取
+    :param output_path: 结果保存的json文件路径，为空时不保存
+    :param work_dir: 生成测试文件的文件夹，默认使用系统临时文件夹，测试结束后删除生成的文件
+    :param algorithms: 测试的算法列表
+    :param block_sizes: 测试的读取块大小列表
+    :param max_workers: 线程池的线程数，默认为CPU核心数+4（最多32）
+    :param tiny_count: 小文件（1KB）数量
+    :param medium_count: 中等文件数量
+    :param medium_size: 中等文件大小（字节）
+    :param large_size: 大文件大小（字节），为0时不测试大文件
+    :return: 测试结果"""
+    return _benchmark_hash(output_path, work_dir, algorithms, block_sizes, max_workers, tiny_count, medium_count,
+                           medium_size, large_size)
+
+
+if __name__ == '__main__':
+    # 不通过lzytools.file导出，使用命令运行：python -m lzytools.file._benchmark [结果文件路径]
+    import sys
+
+    benchmark_hash(sys.argv[1] if len(sys.argv) > 1 else 'benchmark_hash.json')
@@ -0,0 +1,208 @@
+import random
+from collections import Counter
+from typing import Iterator, List, Tuple
+
+from ._hash import _create_hasher
+
+# Gear哈希的查找表（256个64位随机数，固定种子保证不同运行之间的分块结果一致）
+_GEAR_SEED = 0x6C7A79746F6F6C73
+_GEAR_TABLE = None
+_MASK_64 = 0xFFFFFFFFFFFFFFFF
+_WINDOW_SIZE = 64  # 64位哈希值每次左移1位，只受最近64个字节影响
+
+_NUMPY = None  # 可选依赖numpy（首次分块时导入，未安装时为False）
+
+"""----------逻辑函数----------"""
+
+
+def _get_gear_table() -> List[int]:
+    """获取Gear哈希的查找表（首次调用时生成）"""
+    global _GEAR_TABLE
+    if _GEAR_TABLE is None:
+        _random = random.Random(_GEAR_SEED)
+        _GEAR_TABLE = [_random.getrandbits(64) for _ in range(256)]
+    return _GEAR_TABLE
+
+
+def _import_numpy():
+    """导入可选依赖numpy，未安装时返回None"""
+    global _NUMPY
+    if _NUMPY is None:
+        try:
+            import numpy
+            _NUMPY = numpy
+        except ImportError:
+            _NUMPY = False
+    return _NUMPY or None
+
+
+def _find_cut_point(data: bytearray, min_size: int, max_size: int, mask: int) -> int:
+    """使用Gear滚动哈希查找分块边界
+    :param data: 数据
+    :param min_size: 最小分块大小，该范围内不查找边界
+    :param max_size: 最大分块大小，超出时强制分块
+    :param mask: 边界判断掩码，哈希值与掩码按位与为0时视为边界
+    :return: 分块长度"""
+    length = len(data)
+    if length <= min_size:
+        return length
+
+    gear = _get_gear_table()
+    end = min(length, max_size)
+    fingerprint = 0
+    for i in range(min_size, end):
+        fingerprint = ((fingerprint << 1) + gear[data[i]]) & _MASK_64
+        if not fingerprint & mask:
+            return i + 1
+
+    return end
+
+
+def _find_gear_hits(numpy, data: bytes, mask: int):
+    """使用numpy向量化计算每个位置的Gear哈希值（完整的64字节窗口），查找满足边界条件的位置
+    窗口内第k个字节的贡献为gear[字节] << k，通过6次倍增累加得到完整窗口的哈希值
+    :return: 满足边界条件的位置数组（已排序，不包含前63个窗口不完整的位置）"""
+    values = numpy.array(_get_gear_table(), dtype=numpy.uint64)[numpy.frombuffer(data, dtype=numpy.uint8)]
+    shift = 1
+    while shift < _WINDOW_SIZE:
+        values[shift:] += values[:-shift] << numpy.uint64(shift)
+        shift *= 2
+    hits = numpy.flatnonzero((values & numpy.uint64(mask)) == 0)
+    return hits[hits >= _WINDOW_SIZE - 1]
+
+
+def _find_cut_point_numpy(numpy, data: bytearray, hits, min_size: int, max_size: int, mask: int) -> int:
+    """使用预先计算的边界位置查找分块边界，结果与_find_cut_point一致
+    从最小分块位置开始的前63个位置，哈希值只包含部分窗口，仍逐字节计算；之后的哈希值与完整窗口的哈希值相同"""
+    length = len(data)
+    if length <= min_size:
+        return length
+
+    gear = _get_gear_table()
+    end = min(length, max_size)
+    window_end = min(end, min_size + _WINDOW_SIZE - 1)
+    fingerprint = 0
+    for i in range(min_size, window_end):
+        fingerprint = ((fingerprint << 1) + gear[data[i]]) & _MASK_64
+        if not fingerprint & mask:
+            return i + 1
+
+    index = numpy.searchsorted(hits, window_end)
+    if index < len(hits) and hits[index] < end:
+        return int(hits[index]) + 1
+
+    return end
+
+
+def _iter_content_defined_chunks(file_path: str, avg_size: int = 65536, min_size: int = None, max_size: int = None,
+                                 algorithm: str = 'xxhash') -> Iterator[Tuple[int, int, str]]:
+    """按内容定义分块（Gear滚动哈希），逐块返回分块信息
+    文件中插入/删除少量数据时，只影响附近的分块，其余分块的哈希值保持不变
+    安装numpy时使用向量化计算查找分块边界；未安装时逐字节计算，速度约为每秒数MB，不适合处理GB级的文件
+    :param file_path: 文件路径
+    :param avg_size: 平均分块大小，必须为2的幂
+    :param min_size: 最小分块大小，默认为平均分块大小的1/4
+    :param max_size: 最大分块大小，默认为平均分块大小的4倍
+    :param algorithm: 分块哈希值使用的算法
+    :return: 生成器，(分块起始位置, 分块长度, 分块哈希值)"""
+    if avg_size <= 0 or avg_size & (avg_size - 1):
+        raise Exception(f'平均分块大小必须为2的幂：{avg_size}')
+    if min_size is None:
+        min_size = avg_size // 4
+    if max_size is None:
+        max_size = avg_size * 4
+    if not 0 < min_size <= avg_size <= max_size:
+        raise Exception(f'分块大小参数错误：{min_size}, {avg_size}, {max_size}')
+
+    # 使用哈希值的高位判断边界，高位受最近的64个字节共同影响
+    bits = avg_size.bit_length() - 1
+    mask = ((1 << bits) - 1) << (64 - bits)
+    read_size = max(max_size * 4, 1048576)
+
+    numpy = _import_numpy()
+    hits = numpy.empty(0, dtype=numpy.intp) if numpy else None  # 缓冲区中满足边界条件的位置
+
+    offset = 0
+    buffer = bytearray()
+    eof = False
+    with open(file_path, 'rb') as f:
+        while True:
+            # 保证缓冲区中至少有一个最大分块的数据（文件末尾除外）
+            while not eof and len(buffer) < max_size:
+                data = f.read(read_size)
+                if data:
+                    if numpy:
+                        # 只计算新数据的位置（向前多取63个字节作为窗口）
+                        start = max(0, len(buffer) - _WINDOW_SIZE + 1)
+                        new_hits = _find_gear_hits(numpy, bytes(buffer[start:]) + data, mask) + start
+                        hits = numpy.concatenate((hits, new_hits[new_hits >= len(buffer)]))
+                    buffer += data
+                else:
+                    eof = True
+            if not buffer:
+                break
+
+            if numpy:
+                cut = _find_cut_point_numpy(numpy, buffer, hits, min_size, max_size, mask)
+                hits = hits[hits >= cut] - cut
+            else:
+                cut = _find_cut_point(buffer, min_size, max_size, mask)
+            hasher = _create_hasher(algorithm)
+            with memoryview(buffer) as view:
+                hasher.update(view[:cut])
+            yield offset, cut, hasher.hexdigest()
+
+            offset += cut
+            del buffer[:cut]
+
+
+def _calc_chunk_similarity(chunks_1: List[Tuple[int, int, str]], chunks_2: List[Tuple[int, int, str]]) -> float:
+    """根据内容定义分块的结果计算两个文件的相似度（相同分块的数据量占比）
+    :param chunks_1: 文件1的分块信息列表
+    :param chunks_2: 文件2的分块信息列表
+    :return: 相似度，0~1"""
+    total_size = sum(i[1] for i in chunks_1) + sum(i[1] for i in chunks_2)
+    if not total_size:
+        return 1.0
+
+    counter_1 = Counter((digest, length) for _, length, digest in chunks_1)
+    counter_2 = Counter((digest, length) for _, length, digest in chunks_2)
+    shared_size = sum(length * count for (_, length), count in (counter_1 & counter_2).items())
+
+    return shared_size * 2 / total_size
+
+
+"""----------调用函数----------"""
+
+
+def calc_content_defined_chunks(file_path: str, avg_size: int = 65536, min_size: int = None, max_size: int = None,
+                                algorithm: str = 'xxhash') -> List[Tuple[int, int, str]]:
+    """按内容定义分块（Gear滚动哈希），计算每个分块的哈希值
+    文件中插入/删除少量数据时，只影响附近的分块，其余分块的哈希值保持不变
+    :param file_path: 文件路径
+    :param avg_size: 平均分块大小，必须为2的幂
+    :param min_size: 最小分块大小，默认为平均分块大小的1/4
+    :param max_size: 最大分块大小，默认为平均分块大小的4倍
+    :param algorithm: 分块哈希值使用的算法
+    :return: [(分块起始位置, 分块长度, 分块哈希值)]"""
+    return list(_iter_content_defined_chunks(file_path, avg_size, min_size, max_size, algorithm))
+
+
+def iter_content_defined_chunks(file_path: str, avg_size: int = 65536, min_size: int = None, max_size: int = None,
+                                algorithm: str = 'xxhash') -> Iterator[Tuple[int, int, str]]:
+    """按内容定义分块（Gear滚动哈希），逐块返回分块信息
+    :param file_path: 文件路径
+    :param avg_size: 平均分块大小，必须为2的幂
+    :param min_size: 最小分块大小，默认为平均分块大小的1/4
+    :param max_size: 最大分块大小，默认为平均分块大小的4倍
+    :param algorithm: 分块哈希值使用的算法
+    :return: 生成器，(分块起始位置, 分块长度, 分块哈希值)"""
+    return _iter_content_defined_chunks(file_path, avg_size, min_size, max_size, algorithm)
+
+
+def calc_chunk_similarity(chunks_1: List[Tuple[int, int, str]], chunks_2: List[Tuple[int, int, str]]) -> float:
+    """根据内容定义分块的结果计算两个文件的相似度（相同分块的数据量占比）
+    :param chunks_1: 文件1的分块信息列表
+    :param chunks_2: 文件2的分块信息列表
+    :return: 相似度，0~1"""
+    return _calc_chunk_similarity(chunks_1, chunks_2)
@@ -0,0 +1,54 @@
+import os
+from typing import Iterable, Iterator, List, Dict
+
+from ._filepath import remove_subpaths
+from ._hash import _iter_duplicate_groups, _DEFAULT_SAMPLE_SIZE
+from ._info import walk_dir
+
+"""----------逻辑函数----------"""
+
+
+def _iter_file_sizes(paths: Iterable[str]) -> Iterator[tuple]:
+    """遍历路径列表中的所有文件，返回文件路径及其大小（使用scandir缓存的stat结果）
+    :param paths: 文件/文件夹路径列表
+    :return: 生成器，(文件路径, 文件大小)"""
+    for path in remove_subpaths(paths):  # 剔除子路径，防止同一文件被重复统计
+        if os.path.isfile(path):
+            yield path, os.path.getsize(path)
+        elif os.path.isdir(path):
+            for file_path, is_dir, file_size in walk_dir(path):
+                if not is_dir:
+                    yield file_path, file_size
+
+
+def _find_duplicate_files(paths: Iterable[str], algorithm: str = 'xxhash', sample_size: int = _DEFAULT_SAMPLE_SIZE,
+                          min_size: int = 1, max_workers: int = None) -> Iterator[List[str]]:
+    """查找重复文件，按 文件大小->快速指纹->完整哈希值 逐级分组，每组确认后立即返回
+    :param paths: 文件/文件夹路径列表
+    :param algorithm: 完整哈希值使用的算法
+    :param sample_size: 快速指纹每个采样位置读取的字节数
+    :param min_size: 参与查找的最小文件大小（字节），默认忽略空文件
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :return: 生成器，每次返回一组内容相同的文件路径列表"""
+    # 按文件大小分组（仅需目录遍历时的stat结果，不读取文件），再逐组按快速指纹、完整哈希值确认
+    size_groups: Dict[int, list] = {}
+    for file_path, file_size in _iter_file_sizes(paths):
+        if file_size >= min_size:
+            size_groups.setdefault(file_size, []).append(file_path)
+
+    yield from _iter_duplicate_groups(size_groups.values(), algorithm, sample_size, max_workers)
+
+
+"""----------调用函数----------"""
+
+
+def find_duplicate_files(paths: Iterable[str], algorithm: str = 'xxhash', sample_size: int = _DEFAULT_SAMPLE_SIZE,
+                         min_size: int = 1, max_workers: int = None) -> Iterator[List[str]]:
+    """查找重复文件，按 文件大小->快速指纹->完整哈希值 逐级分组，每组确认后立即返回
+    :param paths: 文件/文件夹路径列表
+    :param algorithm: 完整哈希值使用的算法
+    :param sample_size: 快速指纹每个采样位置读取的字节数
+    :param min_size: 参与查找的最小文件大小（字节），默认忽略空文件
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :return: 生成器，每次返回一组内容相同的文件路径列表"""
+    return _find_duplicate_files(paths, algorithm, sample_size, min_size, max_workers)
@@ -1,10 +1,19 @@
+import functools
 import os
 import re
-from typing import Union
+import threading
+import time
+from typing import Union, Iterable, List
+
+from ..common import convert_character_to_half_width
 
 # WINDOWS系统文件命名规则：文件和文件夹不能命名为“.”或“..”，也不能包含以下任何字符: \ / : * ? " < > |
 _ILLEGAL_CHARACTERS = ['\\', '/', ':', '*', '?', '"', '<', '>', '|']
 
+# 预编译的后缀正则：(1)等后缀、（1）等后缀
+_STANDARD_SUFFIX_PATTERN = re.compile(r'\s*\(\d+\)\s*$')
+_FULL_WIDTH_SUFFIX_PATTERN = re.compile(r'\s*（\d+）\s*$')
+
 """----------逻辑函数----------"""
 
 
@@ -33,6 +42,18 @@ def _is_legal_filename(filename: str) -> bool:
     return True
 
 
+@functools.lru_cache(maxsize=None)
+def _get_illegal_character_table(replace_str: str = '') -> dict:
+    """获取替换非法字符的转换表（str.translate使用）"""
+    return str.maketrans({key: replace_str for key in _ILLEGAL_CHARACTERS})
+
+
+@functools.lru_cache(maxsize=256)
+def _get_custom_suffix_pattern(suffix: str) -> re.Pattern:
+    """获取指定后缀+数字组合的正则（缓存编译结果）"""
+    return re.compile(rf'\s*{suffix}\s*\d+\s*$')
+
+
 def _replace_illegal_character_in_filename(filename: str, replace_str: str = '') -> Union[str, bool]:
     """替换文件名中的非法字符
     :param filename: 文件名
@@ -43,14 +64,10 @@ def _replace_illegal_character_in_filename(filename: str, replace_str: str = '')
         raise Exception(f'替换字符非法：{replace_str}')
 
     # 替换非法字符
-    for word in _ILLEGAL_CHARACTERS:
-        filename = filename.replace(word, replace_str)
+    filename = filename.translate(_get_illegal_character_table(replace_str))
 
     # 替换.（强制文件名不能以.开头）
-    while filename[0] == '.':
-        filename = filename[1:]
-
-    filename = filename.strip()
+    filename = filename.lstrip('.').strip()
 
     if not filename:
         raise Exception(f'结果文件名非法：{filename}')
@@ -64,18 +81,110 @@ def _remove_suffix(filetitle: str, suffix: str = None) -> str:
     :param suffix: 指定后缀
     """
     # 剔除(1)等后缀
-    filetitle = re.sub(r'\s*\(\d+\)\s*$', '', filetitle)
+    filetitle = _STANDARD_SUFFIX_PATTERN.sub('', filetitle)
 
     # 剔除（1）等后缀
-    filetitle = re.sub(r'\s*（\d+）\s*$', '', filetitle)
+    filetitle = _FULL_WIDTH_SUFFIX_PATTERN.sub('', filetitle)
 
     # 剔除指定后缀+数字的组合
     if suffix:
-        filetitle = re.sub(rf'\s*{suffix}\s*\d+\s*$', '', filetitle)
+        filetitle = _get_custom_suffix_pattern(suffix).sub('', filetitle)
 
     return filetitle.strip()
 
 
+class NameAllocator:
+    """文件名分配器，用于向同一个文件夹批量生成非重复的文件名
+    初始化时只读取一次文件夹，之后在内存中记录已占用的文件名（不区分大小写）及每个文件名的下一个后缀编号，
+    分配的文件名会被记录为已占用，支持多线程调用
+    :param dirpath: 目标文件夹路径，为None时不读取文件夹
+    :param names: 额外视为已占用的文件名列表
+    """
+
+    def __init__(self, dirpath: str = None, names: Iterable[str] = None):
+        self.dirpath = dirpath
+        self._lock = threading.Lock()
+        self._used_names = set()  # 已占用的文件名（小写）
+        self._counters = {}  # {(文件名, 文件扩展名, 后缀): 下一个后缀编号}
+
+        if dirpath:
+            self._used_names.update(i.lower() for i in os.listdir(dirpath))
+        if names:
+            self._used_names.update(i.lower() for i in names)
+
+    def __contains__(self, filename: str) -> bool:
+        return self.is_used(filename)
+
+    def __len__(self) -> int:
+        return len(self._used_names)
+
+    def refresh(self):
+        """重新读取目标文件夹（保留已分配的文件名）"""
+        if not self.dirpath:
+            return
+        names = [i.lower() for i in os.listdir(self.dirpath)]
+        with self._lock:
+            self._used_names.update(names)
+
+    def is_used(self, filename: str) -> bool:
+        """检查文件名是否已被占用
+        :param filename: 文件名（包含文件扩展名）"""
+        return filename.lower() in self._used_names
+
+    def reserve(self, filename: str) -> bool:
+        """将文件名标记为已占用
+        :param filename: 文件名（包含文件扩展名）
+        :return: 是否成功标记，文件名已被占用时返回False"""
+        filename = filename.lower()
+        with self._lock:
+            if filename in self._used_names:
+                return False
+            self._used_names.add(filename)
+            return True
+
+    def release(self, filename: str):
+        """释放已占用的文件名（例如文件被移出目标文件夹后）
+        :param filename: 文件名（包含文件扩展名）"""
+        with self._lock:
+            self._used_names.discard(filename.lower())
+
+    def allocate(self, filetitle: str, filename_extension: str = None, add_suffix: str = None,
+                 remove_suffix: bool = True) -> str:
+        """生成非重复的文件名，并标记为已占用
+        :param filetitle: 文件名（不包含文件扩展名）
+        :param filename_extension: 文件扩展名（如果是文件的文件名，则必须使用该参数）
+        :param add_suffix: 存在重复文件名时在文件名后添加的后缀，为None时使用Windows重复文件名规则的 (1) 后缀
+        :param remove_suffix: 是否先剔除文件名中原有的后缀
+        :return: 非重复的文件名（包含文件扩展名）"""
+        # 剔除原始后缀
+        if remove_suffix:
+            filetitle = _remove_suffix(filetitle, add_suffix)
+
+        # 标准化文件扩展名
+        if filename_extension:
+            filename_extension = filename_extension.strip().strip('.')
+        extension = f'.{filename_extension}' if filename_extension else ''  # 为空时假设为文件夹的文件名
+
+        with self._lock:
+            filename = f'{filetitle}{extension}'
+            if filename.lower() in self._used_names:
+                # 从上次分配的编号继续累加，直到不存在重复文件名
+                key = (filetitle.lower(), extension.lower(), add_suffix)
+                count = self._counters.get(key, 1)
+                while True:
+                    if add_suffix is None:
+                        filename = f'{filetitle} ({count}){extension}'
+                    else:
+                        filename = f'{filetitle}{add_suffix}{count}{extension}'
+                    count += 1
+                    if filename.lower() not in self._used_names:
+                        break
+                self._counters[key] = count
+
+            self._used_names.add(filename.lower())
+            return filename
+
+
 def _create_nodup_filename_standard_digital_suffix(filetitle: str, check_dirpath: str,
                                                    filename_extension: str = None) -> str:
     """生成文件名在目标文件夹中非重复的文件名（统一数字后缀的文件名，(1)（1）等后缀）
@@ -83,37 +192,7 @@ def _create_nodup_filename_standard_digital_suffix(filetitle: str, check_dirpath
     :param filename_extension: 文件扩展名（如果检查的文件名是文件的文件名，则必须使用该参数）
     :param check_dirpath: 目标文件夹路径
     :return: 非重复的文件名（包含文件扩展名）"""
-    # 剔除后缀
-    filetitle = remove_suffix(filetitle)
-
-    # 标准化文件扩展名
-    if filename_extension:
-        filename_extension = filename_extension.strip().strip('.')
-
-    # 组合文件名
-    if filename_extension:
-        filename = f'{filetitle}.{filename_extension}'  # 假设为文件的文件名
-    else:
-        filename = filetitle  # 假设为文件夹的文件名
-
-    # 检查重复文件名
-    if is_dup_filename(filename, check_dirpath):
-        # 生成无重复的文件名，按照Windows重复文件名规则，一直循环后缀编号累加，直到不存在重复文件名
-        count = 1
-        while True:
-            # 组合文件名
-            if filename_extension:
-                filename = f'{filetitle} ({count}).{filename_extension}'  # 假设为文件的文件名
-            else:
-                filename = f'{filetitle} ({count})'  # 假设为文件夹的文件名
-
-            # 检查
-            if is_dup_filename(filename, check_dirpath):
-                count += 1
-            else:
-                break
-
-    return filename
+    return NameAllocator(check_dirpath).allocate(filetitle, filename_extension)
 
 
 def _create_nodup_filename_custom_suffix(filetitle: str, check_dirpath: str, add_suffix: str,
@@ -124,37 +203,64 @@ def _create_nodup_filename_custom_suffix(filetitle: str, check_dirpath: str, add
     :param check_dirpath: 目标文件夹路径
     :param add_suffix: 存在重复文件名时在文件名后添加的后缀
     :return: 非重复的文件名（包含文件扩展名）"""
-    # 剔除原始后缀
-    filetitle = remove_suffix(filetitle, add_suffix)
-
-    # 标准化文件扩展名
-    if filename_extension:
-        filename_extension = filename_extension.strip().strip('.')
-
-    # 组合文件名
-    if filename_extension:
-        filename = f'{filetitle}.{filename_extension}'  # 假设为文件的文件名
-    else:
-        filename = filetitle  # 假设为文件夹的文件名
-
-    # 检查重复文件名
-    if is_dup_filename(filename, check_dirpath):
-        # 生成无重复的文件名，一直循环后缀编号累加，直到不存在重复文件名
-        count = 1
-        while True:
-            # 组合文件名
-            if filename_extension:
-                filename = f'{filetitle}{add_suffix}{count}.{filename_extension}'  # 假设为文件的文件名
-            else:
-                filename = f'{filetitle}{add_suffix}{count}'  # 假设为文件夹的文件名
-
-            # 检查
-            if is_dup_filename(filename, check_dirpath):
-                count += 1
-            else:
-                break
+    return NameAllocator(check_dirpath).allocate(filetitle, filename_extension, add_suffix)
+
+
+def _sanitize_filenames(filenames: Iterable[str], check_dirpath: str = None, replace_str: str = '',
+                        to_half_width: bool = True, remove_suffix: bool = True, add_suffix: str = None,
+                        has_extension: bool = True, name_allocator: NameAllocator = None,
+                        stats: dict = None) -> List[str]:
+    """批量规范文件名，一次遍历依次执行：转换为半角字符、替换非法字符、剔除后缀、生成非重复的文件名
+    :param filenames: 文件名列表（包含文件扩展名）
+    :param check_dirpath: 目标文件夹路径，生成的文件名不会与该文件夹中已有的文件名重复，为None时只保证结果之间不重复
+    :param replace_str: 用于替换非法字符的新字符
+    :param to_half_width: 是否转换为半角字符
+    :param remove_suffix: 是否剔除(1)（1）等后缀及指定后缀
+    :param add_suffix: 存在重复文件名时在文件名后添加的后缀，为None时使用 (1) 后缀
+    :param has_extension: 文件名是否包含文件扩展名（文件夹名应设为False，防止将文件夹名中的.视为扩展名）
+    :param name_allocator: 文件名分配器（用于多次调用时共用已分配的文件名），设置后忽略check_dirpath参数
+    :param stats: 用于接收处理统计的字典，{'count': 文件名数, 'elapsed': 耗时（秒）, 'names_per_second': 每秒处理的文件名数}
+    :return: 与传入列表一一对应的文件名列表"""
+    if replace_str in _ILLEGAL_CHARACTERS:
+        raise Exception(f'替换字符非法：{replace_str}')
 
-    return filename
+    start_time = time.perf_counter()
+    if name_allocator is None:
+        name_allocator = NameAllocator(check_dirpath)
+    illegal_table = _get_illegal_character_table(replace_str)
+    custom_suffix_pattern = _get_custom_suffix_pattern(add_suffix) if remove_suffix and add_suffix else None
+
+    results = []
+    for filename in filenames:
+        if to_half_width:
+            filename = convert_character_to_half_width(filename)
+        filename = filename.translate(illegal_table)  # 转换为半角字符后可能产生新的非法字符，需要在其后替换
+
+        if has_extension:
+            filetitle, file_extension = os.path.splitext(filename)
+        else:
+            filetitle, file_extension = filename, ''
+
+        # 文件名不能以.开头
+        filetitle = filetitle.lstrip('.').strip()
+        if remove_suffix:
+            filetitle = _STANDARD_SUFFIX_PATTERN.sub('', filetitle)
+            filetitle = _FULL_WIDTH_SUFFIX_PATTERN.sub('', filetitle)
+            if custom_suffix_pattern:
+                filetitle = custom_suffix_pattern.sub('', filetitle)
+            filetitle = filetitle.strip()
+        if not filetitle:
+            raise Exception(f'结果文件名非法：{filename}')
+
+        results.append(name_allocator.allocate(filetitle, file_extension, add_suffix, remove_suffix=False))
+
+    if stats is not None:
+        elapsed = time.perf_counter() - start_time
+        stats['count'] = len(results)
+        stats['elapsed'] = elapsed
+        stats['names_per_second'] = len(results) / elapsed if elapsed else 0.0
+
+    return results
 
 
 """----------调用函数----------"""
@@ -211,3 +317,22 @@ def create_nodup_filename_custom_suffix(filetitle: str, check_dirpath: str, add_
     :param add_suffix: 存在重复文件名时在文件名后添加的后缀
     :return: 非重复的文件名（包含文件扩展名）"""
     return _create_nodup_filename_custom_suffix(filetitle, check_dirpath, add_suffix, filename_extension)
+
+
+def sanitize_filenames(filenames: Iterable[str], check_dirpath: str = None, replace_str: str = '',
+                       to_half_width: bool = True, remove_suffix: bool = True, add_suffix: str = None,
+                       has_extension: bool = True, name_allocator: NameAllocator = None,
+                       stats: dict = None) -> List[str]:
+    """批量规范文件名，一次遍历依次执行：转换为半角字符、替换非法字符、剔除后缀、生成非重复的文件名
+    :param filenames: 文件名列表（包含文件扩展名）
+    :param check_dirpath: 目标文件夹路径，生成的文件名不会与该文件夹中已有的文件名重复，为None时只保证结果之间不重复
+    :param replace_str: 用于替换非法字符的新字符
+    :param to_half_width: 是否转换为半角字符
+    :param remove_suffix: 是否剔除(1)（1）等后缀及指定后缀
+    :param add_suffix: 存在重复文件名时在文件名后添加的后缀，为None时使用 (1) 后缀
+    :param has_extension: 文件名是否包含文件扩展名（文件夹名应设为False，防止将文件夹名中的.视为扩展名）
+    :param name_allocator: 文件名分配器（用于多次调用时共用已分配的文件名），设置后忽略check_dirpath参数
+    :param stats: 用于接收处理统计的字典，{'count': 文件名数, 'elapsed': 耗时（秒）, 'names_per_second': 每秒处理的文件名数}
+    :return: 与传入列表一一对应的文件名列表"""
+    return _sanitize_filenames(filenames, check_dirpath, replace_str, to_half_width, remove_suffix, add_suffix,
+                               has_extension, name_allocator, stats)
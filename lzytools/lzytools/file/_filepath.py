@@ -1,9 +1,8 @@
+import bisect
 import os
 import subprocess
 from pathlib import Path
-from typing import Tuple
-
-import natsort
+from typing import Tuple, List, Iterable
 
 """----------逻辑函数----------"""
 
@@ -71,20 +70,35 @@ def _get_parent_dirpath(filepath: str, parent_level: int = 1):
     return parent_path
 
 
+def _get_path_key(path: str) -> str:
+    """生成已规范化路径的排序键（分隔符替换为最小的字符，排序后父路径总是排在其所有子路径之前，且子路径连续排列）"""
+    return os.path.normcase(path).rstrip(os.sep).replace(os.sep, '\0') + '\0'
+
+
+def _get_top_path_keys(paths: Iterable[str]) -> List[str]:
+    """获取路径列表中最上级路径的排序键列表（已排序，相互之间不存在父子关系）"""
+    top_keys = []
+    for key in sorted(_get_path_key(path) for path in paths):
+        # 排序后子路径紧跟在父路径之后，只需要与上一个保留的路径比较
+        if top_keys and key.startswith(top_keys[-1]):
+            continue
+        top_keys.append(key)
+    return top_keys
+
+
 def _remove_subpaths(paths: list):
-    """剔除传入路径列表中的子路径，仅保留最上级路径"""
+    """剔除传入路径列表中的子路径，仅保留最上级路径（按传入顺序返回，不进行排序）"""
     paths = [os.path.normpath(path) for path in paths]
-    paths = natsort.os_sorted(paths)  # 排序路径
-    subpaths = []
-    for path in paths:
-        paths_split_parents = _get_parent_dirpaths(path)
-        # 判断其父路径是否与原始列表存在交集，如果存在则说明其是子路径
-        _s1 = set(paths)
-        _s2 = set(paths_split_parents)
-        if _s1 & _s2:
-            subpaths.append(path)
+    # 按排序键排序后，子路径连续排列在其父路径之后，一次遍历即可剔除（相同路径均保留）
+    keep = [False] * len(paths)
+    last_key = None
+    for key, index in sorted(zip(map(_get_path_key, paths), range(len(paths)))):
+        if last_key is not None and key != last_key and key.startswith(last_key):
+            continue
+        keep[index] = True
+        last_key = key
 
-    return [i for i in paths if i not in subpaths]
+    return [path for path, is_top in zip(paths, keep) if is_top]
 
 
 def _is_subpath(parent_path: str, child_path: str) -> bool:
@@ -101,6 +115,21 @@ def _is_subpath(parent_path: str, child_path: str) -> bool:
         return False
 
 
+def _is_subpaths(parent_paths: Iterable[str], child_paths: Iterable[str]) -> List[bool]:
+    """批量判断路径是否为任一指定路径的子路径（包括路径本身）
+    :param parent_paths: 父路径列表
+    :param child_paths: 需要判断的路径列表
+    :return: 与需要判断的路径列表一一对应的判断结果"""
+    # 相互之间不存在父子关系的父路径排序后，只有排在子路径之前的最后一个父路径可能是其上级路径
+    top_keys = _get_top_path_keys(os.path.abspath(path) for path in parent_paths)
+    results = []
+    for child_path in child_paths:
+        key = _get_path_key(os.path.abspath(child_path))
+        index = bisect.bisect_right(top_keys, key) - 1
+        results.append(index >= 0 and key.startswith(top_keys[index]))
+    return results
+
+
 def _copy_file_to_clipboard(file_path: str):
     """调用PowerShell命令复制文件到剪切板"""
     cmd = f'powershell "Set-Clipboard -Path \'{file_path}\'"'
@@ -114,7 +143,7 @@ def split_path(path: str) -> Tuple[str, str, str]:
     """拆分路径为父目录路径，文件名（不含文件扩展名），文件扩展名
     :param path: 需要拆分的路径
     :return: 父目录路径，文件名（不含文件扩展名），文件扩展名"""
-    return split_path(path)
+    return _split_path(path)
 
 
 def reverse_path(path: str) -> str:
@@ -140,7 +169,7 @@ def get_parent_dirpath(filepath: str, parent_level: int = 1):
 
 
 def remove_subpaths(paths: list):
-    """剔除传入路径列表中的子路径，仅保留最上级路径"""
+    """剔除传入路径列表中的子路径，仅保留最上级路径（按传入顺序返回，需要排序时由调用方自行排序）"""
     return _remove_subpaths(paths)
 
 
@@ -149,6 +178,14 @@ def is_subpath(parent_path: str, child_path: str) -> bool:
     return _is_subpath(parent_path, child_path)
 
 
+def is_subpaths(parent_paths: Iterable[str], child_paths: Iterable[str]) -> List[bool]:
+    """批量判断路径是否为任一指定路径的子路径（包括路径本身）
+    :param parent_paths: 父路径列表
+    :param child_paths: 需要判断的路径列表
+    :return: 与需要判断的路径列表一一对应的判断结果"""
+    return _is_subpaths(parent_paths, child_paths)
+
+
 def copy_file_to_clipboard(file_path: str):
     """调用PowerShell命令复制文件到剪切板"""
     return _copy_file_to_clipboard(file_path)
@@ -1,105 +1,446 @@
 import hashlib
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Union, Iterable, Iterator, Tuple, Dict, List, Callable, Any
 
 import xxhash
 
+# 支持的哈希算法，其余算法名称交由hashlib.new处理
+_HASHER_FACTORY = {'xxhash': xxhash.xxh64,
+                   'md5': hashlib.md5,
+                   'sha256': hashlib.sha256}
+
+# 默认读取块大小（1MB），较大的块可以减少系统调用次数
+_DEFAULT_BLOCK_SIZE = 1048576
+
+# 使用内存映射读取的文件大小阈值（64MB），小文件使用mmap的额外开销大于收益
+_MMAP_THRESHOLD = 67108864
+
+# 快速指纹每个采样位置的默认读取字节数（64KB）
+_DEFAULT_SAMPLE_SIZE = 65536
+
 """----------逻辑函数----------"""
 
 
+def _create_hasher(algorithm: str):
+    """按算法名称创建哈希对象
+    :param algorithm: 算法名称，xxhash/md5/sha256或hashlib支持的其他算法"""
+    algorithm = algorithm.lower()
+    if algorithm in _HASHER_FACTORY:
+        return _HASHER_FACTORY[algorithm]()
+
+    try:
+        return hashlib.new(algorithm)
+    except ValueError:
+        raise Exception(f'不支持的哈希算法：{algorithm}')
+
+
+def _normalize_algorithms(algorithms: Union[str, Iterable[str]]) -> list:
+    """规范化算法列表（转小写并去重，保持原顺序）"""
+    if isinstance(algorithms, str):
+        algorithms = [algorithms]
+
+    normalized = []
+    for algorithm in algorithms:
+        algorithm = algorithm.lower()
+        if algorithm not in normalized:
+            normalized.append(algorithm)
+
+    if not normalized:
+        raise Exception('未指定哈希算法')
+
+    return normalized
+
+
+def _update_hashers_from_buffer(hashers: list, data: Union[bytes, bytearray, memoryview, mmap.mmap],
+                                block_size: int = _DEFAULT_BLOCK_SIZE):
+    """使用memoryview切片将缓冲区数据传入哈希对象（切片不会复制数据）
+    :param hashers: 哈希对象列表
+    :param data: 支持缓冲区协议的对象
+    :param block_size: 切片大小，为0时一次性传入整个缓冲区"""
+    with memoryview(data) as view:
+        if not block_size or len(view) <= block_size:
+            for hasher in hashers:
+                hasher.update(view)
+            return
+
+        for i in range(0, len(view), block_size):
+            chunk = view[i:i + block_size]
+            for hasher in hashers:
+                hasher.update(chunk)
+            chunk.release()
+
+
+def _update_hashers_from_file(hashers: list, file_path: str, block_size: int = _DEFAULT_BLOCK_SIZE,
+                              use_mmap: bool = None):
+    """读取文件数据并传入哈希对象
+    :param hashers: 哈希对象列表
+    :param file_path: 文件路径
+    :param block_size: 读取块大小
+    :param use_mmap: 是否使用内存映射读取，默认按文件大小自动选择"""
+    with open(file_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if use_mmap is None:
+            use_mmap = file_size >= _MMAP_THRESHOLD
+
+        # 内存映射读取，直接在映射内存上切片计算，不产生数据块对象（空文件无法映射）
+        if use_mmap and file_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _update_hashers_from_buffer(hashers, mm, block_size)
+            return
+
+        # 普通读取，复用同一个缓冲区，避免每次read()都创建新的bytes对象
+        buffer = bytearray(block_size)
+        with memoryview(buffer) as view:
+            while size := f.readinto(buffer):
+                chunk = view[:size]
+                for hasher in hashers:
+                    hasher.update(chunk)
+                chunk.release()
+
+
+def _calc_hashes(file_path: str, algorithms: Union[str, Iterable[str]] = 'xxhash',
+                 block_size: int = _DEFAULT_BLOCK_SIZE, use_mmap: bool = None) -> Dict[str, str]:
+    """读取一次文件，同时计算多种哈希值
+    :param file_path: 文件路径
+    :param algorithms: 算法名称或算法名称列表
+    :param block_size: 读取块大小
+    :param use_mmap: 是否使用内存映射读取，默认对64MB以上的文件使用
+    :return: {算法名称: 哈希值}"""
+    hashers = {algorithm: _create_hasher(algorithm) for algorithm in _normalize_algorithms(algorithms)}
+    _update_hashers_from_file(list(hashers.values()), file_path, block_size, use_mmap)
+
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+
+def _iter_map_files(func: Callable[[str], Any], file_paths: Iterable[str],
+                    max_workers: int = None) -> Iterator[Tuple[str, Any]]:
+    """使用线程池对文件列表逐个执行函数，按完成顺序逐个返回结果
+    （hashlib/xxhash在计算较大数据块时会释放GIL，多线程可以并行计算）
+    :param func: 传入文件路径的函数
+    :param file_paths: 文件路径列表
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :return: 生成器，(文件路径, 函数返回值)，读取失败的文件返回值为None"""
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    max_pending = max_workers * 4  # 限制同时提交的任务数，防止文件数量过多时占用大量内存
+
+    file_paths = iter(file_paths)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def submit_next() -> bool:
+            """提交下一个文件，没有剩余文件时返回False"""
+            for file_path in file_paths:
+                future = executor.submit(func, file_path)
+                pending[future] = file_path
+                return True
+            return False
+
+        while len(pending) < max_pending and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path = pending.pop(future)
+                try:
+                    yield file_path, future.result()
+                except OSError as e:  # 文件不存在或被占用
+                    print(f'报错提示：{e}')
+                    yield file_path, None
+                submit_next()
+
+
+def _iter_hashes_from_files(file_paths: Iterable[str], algorithms: Union[str, Iterable[str]] = 'xxhash',
+                            max_workers: int = None,
+                            block_size: int = _DEFAULT_BLOCK_SIZE,
+                            use_mmap: bool = None) -> Iterator[Tuple[str, Union[Dict[str, str], None]]]:
+    """使用线程池批量计算文件哈希值，按完成顺序逐个返回结果
+    :param file_paths: 文件路径列表
+    :param algorithms: 算法名称或算法名称列表，每个文件只读取一次
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :param block_size: 读取块大小
+    :param use_mmap: 是否使用内存映射读取，默认对64MB以上的文件使用
+    :return: 生成器，(文件路径, {算法名称: 哈希值})，读取失败的文件哈希值为None"""
+    algorithms = _normalize_algorithms(algorithms)
+    return _iter_map_files(lambda file_path: _calc_hashes(file_path, algorithms, block_size, use_mmap),
+                           file_paths, max_workers)
+
+
+def _calc_quick_fingerprint(file_path: str, sample_size: int = _DEFAULT_SAMPLE_SIZE) -> str:
+    """计算文件的快速指纹（xxHash），仅读取文件大小及头部、中部、尾部的部分数据，用于快速排除非重复文件
+    指纹不同的文件一定不同，指纹相同的文件需要再计算完整哈希值确认
+    :param file_path: 文件路径
+    :param sample_size: 每个采样位置读取的字节数
+    :return: 指纹"""
+    return _calc_quick_fingerprint_with_size(file_path, sample_size)[1]
+
+
+def _calc_quick_fingerprint_with_size(file_path: str, sample_size: int = _DEFAULT_SAMPLE_SIZE) -> Tuple[int, str]:
+    """计算文件的快速指纹，同时返回计算时的文件大小（不需要再单独获取文件大小）
+    :param file_path: 文件路径
+    :param sample_size: 每个采样位置读取的字节数
+    :return: (文件大小, 指纹)"""
+    hasher = xxhash.xxh64()
+    with open(file_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        hasher.update(file_size.to_bytes(8, 'little'))
+
+        if file_size <= sample_size * 3:  # 小文件直接读取全部数据
+            hasher.update(f.read())
+        else:
+            for offset in (0, (file_size - sample_size) // 2, file_size - sample_size):
+                f.seek(offset)
+                hasher.update(f.read(sample_size))
+
+    return file_size, hasher.hexdigest()
+
+
+def _iter_duplicate_groups(candidate_groups: Iterable[List[str]], algorithm: str = 'xxhash',
+                           sample_size: int = _DEFAULT_SAMPLE_SIZE,
+                           max_workers: int = None) -> Iterator[List[str]]:
+    """查找重复文件：在每个候选组内先计算快速指纹，仅对指纹相同的文件计算完整哈希值，每组确认后立即返回
+    指纹阶段与完整哈希阶段共用一个线程池，完整哈希任务优先提交，使已有的分组尽快确认并释放内存
+    :param candidate_groups: 候选文件组（例如按文件大小分组），只比较同一组内的文件，按需逐组读取
+    :param algorithm: 完整哈希值使用的算法
+    :param sample_size: 快速指纹每个采样位置读取的字节数
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :return: 生成器，每次返回一组内容相同的文件路径列表"""
+    algorithm = algorithm.lower()
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    max_pending = max_workers * 4  # 限制同时提交的任务数
+
+    candidate_groups = enumerate(candidate_groups)
+    fingerprint_tasks = deque()  # (候选组编号, 文件路径)
+    hash_tasks = deque()  # (分组键, 文件路径)
+    fingerprint_remaining: Dict[int, int] = {}  # {候选组编号: 剩余未计算指纹的文件数}
+    fingerprint_groups: Dict[int, Dict[tuple, list]] = {}  # {候选组编号: {(文件大小, 指纹): [文件路径]}}
+    hash_groups: Dict[tuple, Dict[str, list]] = {}  # {(候选组编号, 文件大小, 指纹): {哈希值: [文件路径]}}
+    hash_remaining: Dict[tuple, int] = {}  # {(候选组编号, 文件大小, 指纹): 剩余未计算哈希值的文件数}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+
+        def submit_tasks():
+            """按优先级提交任务，直至达到同时提交的任务数上限，指纹任务用完时再读取下一个候选组"""
+            while len(pending) < max_pending:
+                if hash_tasks:
+                    key, file_path = hash_tasks.popleft()
+                    future = executor.submit(_calc_hashes, file_path, algorithm)
+                    pending[future] = ('hash', key, file_path)
+                elif fingerprint_tasks:
+                    index, file_path = fingerprint_tasks.popleft()
+                    future = executor.submit(_calc_quick_fingerprint_with_size, file_path, sample_size)
+                    pending[future] = ('fingerprint', index, file_path)
+                else:
+                    for index, group in candidate_groups:
+                        if len(group) > 1:
+                            fingerprint_tasks.extend((index, file_path) for file_path in group)
+                            fingerprint_remaining[index] = len(group)
+                            break
+                    else:
+                        break
+
+        submit_tasks()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, key, file_path = pending.pop(future)
+                try:
+                    result = future.result()
+                except OSError as e:  # 文件不存在或被占用
+                    print(f'报错提示：{e}')
+                    result = None
+
+                # 按快速指纹分组（指纹相同时，即使已包含全部数据，也使用指定算法计算完整哈希值确认）
+                if stage == 'fingerprint':
+                    index = key
+                    if result is not None:
+                        fingerprint_groups.setdefault(index, {}).setdefault(result, []).append(file_path)
+                    fingerprint_remaining[index] -= 1
+                    if fingerprint_remaining[index]:
+                        continue
+
+                    # 该候选组的文件已全部计算指纹
+                    del fingerprint_remaining[index]
+                    for (file_size, fingerprint), group in fingerprint_groups.pop(index, {}).items():
+                        if len(group) > 1:
+                            hash_key = (index, file_size, fingerprint)
+                            hash_remaining[hash_key] = len(group)
+                            hash_tasks.extend((hash_key, i) for i in group)
+
+                # 按完整哈希值分组
+                else:
+                    if result is not None:
+                        hash_groups.setdefault(key, {}).setdefault(result[algorithm], []).append(file_path)
+                    hash_remaining[key] -= 1
+                    if hash_remaining[key]:
+                        continue
+
+                    del hash_remaining[key]
+                    for group in hash_groups.pop(key, {}).values():
+                        if len(group) > 1:
+                            yield group
+
+            submit_tasks()
+
+
+def _group_duplicate_files(file_paths: Iterable[str], algorithm: str = 'xxhash',
+                           sample_size: int = _DEFAULT_SAMPLE_SIZE, max_workers: int = None) -> List[List[str]]:
+    """查找重复文件：先计算快速指纹，仅对指纹相同的文件计算完整哈希值
+    :param file_paths: 文件路径列表
+    :param algorithm: 完整哈希值使用的算法
+    :param sample_size: 快速指纹每个采样位置读取的字节数
+    :param max_workers: 最大线程数
+    :return: 重复文件组列表，每组为内容相同的文件路径列表"""
+    return list(_iter_duplicate_groups([list(file_paths)], algorithm, sample_size, max_workers))
+
+
+def _calc_hashes_from_bytes(data: Union[bytes, bytearray, memoryview],
+                            algorithms: Union[str, Iterable[str]] = 'xxhash') -> Dict[str, str]:
+    """从字节流同时计算多种哈希值（不复制数据）
+    :param data: 字节流，支持bytes/bytearray/memoryview
+    :param algorithms: 算法名称或算法名称列表
+    :return: {算法名称: 哈希值}"""
+    hashers = {algorithm: _create_hasher(algorithm) for algorithm in _normalize_algorithms(algorithms)}
+    _update_hashers_from_buffer(list(hashers.values()), data, 0)
+
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+
 def _calc_xxhash_from_bytes(data: bytes) -> str:
     """从字节流计算xxHash"""
-    hasher = xxhash.xxh64()
-    hasher.update(data)
-    return hasher.hexdigest()
+    return _calc_hashes_from_bytes(data, 'xxhash')['xxhash']
 
 
-def _calc_xxhash_from_file(file_path: str, block_size: int = 65536) -> str:
+def _calc_xxhash_from_file(file_path: str, block_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件计算xxHash"""
-    hasher = xxhash.xxh64()
-    with open(file_path, 'rb') as f:
-        while chunk := f.read(block_size):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+    return _calc_hashes(file_path, 'xxhash', block_size)['xxhash']
 
 
-def _calc_xxhash_from_files(file_paths: list, block_size: int = 65536) -> str:
+def _calc_xxhash_from_files(file_paths: list, block_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件列表计算xxHash"""
     hasher = xxhash.xxh64()
     for file_path in file_paths:
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(block_size):
-                hasher.update(chunk)
+        _update_hashers_from_file([hasher], file_path, block_size)
     return hasher.hexdigest()
 
 
-def _calc_md5_from_file(file_path: str, chunk_size: int = 8192) -> str:
+def _calc_md5_from_file(file_path: str, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件计算MD5"""
-    md5 = hashlib.md5()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            md5.update(chunk)
-    return md5.hexdigest()
+    return _calc_hashes(file_path, 'md5', chunk_size)['md5']
 
 
-def _calc_md5_from_bytes(data: bytes, chunk_size: int = 8192) -> str:
+def _calc_md5_from_bytes(data: bytes, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从字节流计算MD5"""
     md5 = hashlib.md5()
-    for i in range(0, len(data), chunk_size):
-        chunk = data[i:i + chunk_size]
-        md5.update(chunk)
+    _update_hashers_from_buffer([md5], data, chunk_size)
     return md5.hexdigest()
 
 
-def _calc_sha256_from_file(file_path: str, chunk_size: int = 8192) -> str:
+def _calc_sha256_from_file(file_path: str, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件计算SHA-256"""
-    sha256 = hashlib.sha256()
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+    return _calc_hashes(file_path, 'sha256', chunk_size)['sha256']
 
 
-def _calc_sha256_from_bytes(data: bytes, chunk_size: int = 8192) -> str:
+def _calc_sha256_from_bytes(data: bytes, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从字节流计算SHA-256"""
     sha256 = hashlib.sha256()
-    for i in range(0, len(data), chunk_size):
-        chunk = data[i:i + chunk_size]
-        sha256.update(chunk)
+    _update_hashers_from_buffer([sha256], data, chunk_size)
     return sha256.hexdigest()
 
 
 """----------调用函数----------"""
 
 
+def calc_hashes(file_path: str, algorithms: Union[str, Iterable[str]] = 'xxhash',
+                block_size: int = _DEFAULT_BLOCK_SIZE, use_mmap: bool = None) -> Dict[str, str]:
+    """读取一次文件，同时计算多种哈希值
+    :param file_path: 文件路径
+    :param algorithms: 算法名称或算法名称列表，例如['xxhash', 'md5', 'sha256']
+    :param block_size: 读取块大小
+    :param use_mmap: 是否使用内存映射读取，默认对64MB以上的文件使用
+    :return: {算法名称: 哈希值}"""
+    return _calc_hashes(file_path, algorithms, block_size, use_mmap)
+
+
+def calc_hashes_from_bytes(data: Union[bytes, bytearray, memoryview],
+                           algorithms: Union[str, Iterable[str]] = 'xxhash') -> Dict[str, str]:
+    """从字节流同时计算多种哈希值（不复制数据）
+    :param data: 字节流，支持bytes/bytearray/memoryview
+    :param algorithms: 算法名称或算法名称列表，例如['xxhash', 'md5', 'sha256']
+    :return: {算法名称: 哈希值}"""
+    return _calc_hashes_from_bytes(data, algorithms)
+
+
 def calc_xxhash_from_bytes(data: bytes) -> str:
     """从字节流计算xxHash"""
     return _calc_xxhash_from_bytes(data)
 
 
-def calc_xxhash_from_file(file_path: str, block_size: int = 65536) -> str:
+def calc_xxhash_from_file(file_path: str, block_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件计算xxHash"""
     return _calc_xxhash_from_file(file_path, block_size)
 
 
-def calc_xxhash_from_files(file_paths: list, block_size: int = 65536) -> str:
+def calc_xxhash_from_files(file_paths: list, block_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件列表计算xxHash"""
     return _calc_xxhash_from_files(file_paths, block_size)
 
 
-def calc_md5_from_file(file_path: str, chunk_size: int = 8192) -> str:
+def calc_md5_from_file(file_path: str, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件计算MD5"""
     return _calc_md5_from_file(file_path, chunk_size)
 
 
-def calc_md5_from_bytes(data: bytes, chunk_size: int = 8192) -> str:
+def calc_md5_from_bytes(data: bytes, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从字节流计算MD5"""
     return _calc_md5_from_bytes(data, chunk_size)
 
 
-def calc_sha256_from_file(file_path: str, chunk_size: int = 8192) -> str:
+def calc_sha256_from_file(file_path: str, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从文件计算SHA-256"""
     return _calc_sha256_from_file(file_path, chunk_size)
 
 
-def calc_sha256_from_bytes(data: bytes, chunk_size: int = 8192) -> str:
+def calc_sha256_from_bytes(data: bytes, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
     """从字节流计算SHA-256"""
     return _calc_sha256_from_bytes(data, chunk_size)
+
+
+def iter_hashes_from_files(file_paths: Iterable[str], algorithms: Union[str, Iterable[str]] = 'xxhash',
+                           max_workers: int = None,
+                           block_size: int = _DEFAULT_BLOCK_SIZE,
+                           use_mmap: bool = None) -> Iterator[Tuple[str, Union[Dict[str, str], None]]]:
+    """使用线程池批量计算文件哈希值，按完成顺序逐个返回结果
+    :param file_paths: 文件路径列表
+    :param algorithms: 算法名称或算法名称列表，每个文件只读取一次
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :param block_size: 读取块大小
+    :param use_mmap: 是否使用内存映射读取，默认对64MB以上的文件使用
+    :return: 生成器，(文件路径, {算法名称: 哈希值})，读取失败的文件哈希值为None"""
+    return _iter_hashes_from_files(file_paths, algorithms, max_workers, block_size, use_mmap)
+
+
+def calc_quick_fingerprint(file_path: str, sample_size: int = _DEFAULT_SAMPLE_SIZE) -> str:
+    """计算文件的快速指纹（xxHash），仅读取文件大小及头部、中部、尾部的部分数据，用于快速排除非重复文件
+    指纹不同的文件一定不同，指纹相同的文件需要再计算完整哈希值确认
+    :param file_path: 文件路径
+    :param sample_size: 每个采样位置读取的字节数
+    :return: 指纹"""
+    return _calc_quick_fingerprint(file_path, sample_size)
+
+
+def group_duplicate_files(file_paths: Iterable[str], algorithm: str = 'xxhash',
+                          sample_size: int = _DEFAULT_SAMPLE_SIZE, max_workers: int = None) -> List[List[str]]:
+    """查找重复文件：先计算快速指纹，仅对指纹相同的文件计算完整哈希值
+    :param file_paths: 文件路径列表
+    :param algorithm: 完整哈希值使用的算法
+    :param sample_size: 快速指纹每个采样位置读取的字节数
+    :param max_workers: 最大线程数
+    :return: 重复文件组列表，每组为内容相同的文件路径列表"""
+    return _group_duplicate_files(file_paths, algorithm, sample_size, max_workers)
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Iterable, AsyncIterable, AsyncIterator, Tuple, Dict
+
+from ._hash import _calc_hashes, _normalize_algorithms, _DEFAULT_BLOCK_SIZE
+
+# 异步哈希函数共用的线程池（首次调用时创建）
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+"""----------逻辑函数----------"""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取异步哈希函数共用的线程池"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4),
+                                           thread_name_prefix='lzytools_hash')
+        return _EXECUTOR
+
+
+def _set_hash_executor(executor: Union[ThreadPoolExecutor, None]):
+    """替换异步哈希函数共用的线程池
+    :param executor: 线程池，为None时在下次调用时重新创建默认线程池"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        _EXECUTOR = executor
+
+
+async def _async_calc_hashes(file_path: str, algorithms: Union[str, Iterable[str]] = 'xxhash',
+                             block_size: int = _DEFAULT_BLOCK_SIZE) -> Dict[str, str]:
+    """异步计算文件哈希值（在共用线程池中读取文件，不阻塞事件循环）
+    :param file_path: 文件路径
+    :param algorithms: 算法名称或算法名称列表
+    :param block_size: 读取块大小
+    :return: {算法名称: 哈希值}"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), _calc_hashes, file_path, algorithms, block_size)
+
+
+async def _to_async_iterator(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    """将普通迭代对象转换为异步迭代对象"""
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _async_iter_hashes_from_files(file_paths: Union[Iterable[str], AsyncIterable[str]],
+                                        algorithms: Union[str, Iterable[str]] = 'xxhash', concurrency: int = 64,
+                                        block_size: int = _DEFAULT_BLOCK_SIZE
+                                        ) -> AsyncIterator[Tuple[str, Union[Dict[str, str], None]]]:
+    """异步批量计算文件哈希值，按完成顺序逐个返回结果
+    :param file_paths: 文件路径列表，支持异步迭代对象
+    :param algorithms: 算法名称或算法名称列表
+    :param concurrency: 同时计算的最大文件数
+    :param block_size: 读取块大小
+    :return: 异步生成器，(文件路径, {算法名称: 哈希值})，读取失败的文件哈希值为None"""
+    algorithms = _normalize_algorithms(algorithms)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = asyncio.Queue()
+
+    async def calc(file_path: str):
+        error = None
+        try:
+            digests = await _async_calc_hashes(file_path, algorithms, block_size)
+        except OSError as e:  # 文件不存在或被占用
+            print(f'报错提示：{e}')
+            digests = None
+        except Exception as e:
+            digests = None
+            error = e
+        await results.put((file_path, digests, error))
+
+    async def submit():
+        """逐个提交文件，达到并发上限时等待（结果被取出后才释放并发名额，防止结果堆积）"""
+        tasks = set()
+        try:
+            async for file_path in _to_async_iterator(file_paths):
+                await semaphore.acquire()
+                task = asyncio.ensure_future(calc(file_path))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await results.put(None)  # 结束标记
+
+    submit_task = asyncio.ensure_future(submit())
+    try:
+        while (result := await results.get()) is not None:
+            semaphore.release()
+            file_path, digests, error = result
+            if error is not None:
+                raise error
+            yield file_path, digests
+        await submit_task  # 传递提交过程中的异常
+    finally:
+        submit_task.cancel()
+
+
+"""----------调用函数----------"""
+
+
+def set_hash_executor(executor: Union[ThreadPoolExecutor, None]):
+    """替换异步哈希函数共用的线程池
+    :param executor: 线程池，为None时在下次调用时重新创建默认线程池"""
+    _set_hash_executor(executor)
+
+
+async def async_calc_hashes(file_path: str, algorithms: Union[str, Iterable[str]] = 'xxhash',
+                            block_size: int = _DEFAULT_BLOCK_SIZE) -> Dict[str, str]:
+    """异步计算文件哈希值（在共用线程池中读取文件，不阻塞事件循环）
+    :param file_path: 文件路径
+    :param algorithms: 算法名称或算法名称列表
+    :param block_size: 读取块大小
+    :return: {算法名称: 哈希值}"""
+    return await _async_calc_hashes(file_path, algorithms, block_size)
+
+
+async def async_calc_xxhash_from_file(file_path: str, block_size: int = _DEFAULT_BLOCK_SIZE) -> str:
+    """异步从文件计算xxHash"""
+    return (await _async_calc_hashes(file_path, 'xxhash', block_size))['xxhash']
+
+
+async def async_calc_md5_from_file(file_path: str, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
+    """异步从文件计算MD5"""
+    return (await _async_calc_hashes(file_path, 'md5', chunk_size))['md5']
+
+
+async def async_calc_sha256_from_file(file_path: str, chunk_size: int = _DEFAULT_BLOCK_SIZE) -> str:
+    """异步从文件计算SHA-256"""
+    return (await _async_calc_hashes(file_path, 'sha256', chunk_size))['sha256']
+
+
+def async_iter_hashes_from_files(file_paths: Union[Iterable[str], AsyncIterable[str]],
+                                 algorithms: Union[str, Iterable[str]] = 'xxhash', concurrency: int = 64,
+                                 block_size: int = _DEFAULT_BLOCK_SIZE
+                                 ) -> AsyncIterator[Tuple[str, Union[Dict[str, str], None]]]:
+    """异步批量计算文件哈希值，按完成顺序逐个返回结果（async for）
+    :param file_paths: 文件路径列表，支持异步迭代对象
+    :param algorithms: 算法名称或算法名称列表
+    :param concurrency: 同时计算的最大文件数
+    :param block_size: 读取块大小
+    :return: 异步生成器，(文件路径, {算法名称: 哈希值})，读取失败的文件哈希值为None"""
+    return _async_iter_hashes_from_files(file_paths, algorithms, concurrency, block_size)
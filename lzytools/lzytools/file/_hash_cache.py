@@ -0,0 +1,245 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Union, Iterable, Iterator, Tuple, Dict
+
+from ._hash import _calc_hashes, _normalize_algorithms, _DEFAULT_BLOCK_SIZE
+
+
+class HashCache:
+    """本地哈希缓存（SQLite），以路径+文件签名（大小、修改时间、inode）作为键
+    文件未变化时直接返回缓存的哈希值，文件大小或修改时间变化时自动作废旧记录
+    :param db_path: 缓存数据库文件路径
+    :param max_entries: 最大缓存条数，超出后按最近访问时间淘汰旧记录，为0时不限制
+    """
+
+    _EVICT_CHECK_INTERVAL = 1000  # 每写入n条记录检查一次缓存条数
+
+    def __init__(self, db_path: str, max_entries: int = 1000000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()  # sqlite连接对象不能被多个线程同时使用
+        self._write_count = 0
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS hashes ('
+                           'path TEXT NOT NULL, '
+                           'algorithm TEXT NOT NULL, '
+                           'size INTEGER NOT NULL, '
+                           'mtime_ns INTEGER NOT NULL, '
+                           'inode INTEGER NOT NULL, '
+                           'digest TEXT NOT NULL, '
+                           'last_access REAL NOT NULL, '
+                           'PRIMARY KEY (path, algorithm))')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON hashes (last_access)')
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """关闭缓存数据库"""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    @staticmethod
+    def _get_key(file_path: str) -> str:
+        """获取缓存键中的路径（绝对路径）"""
+        return os.path.abspath(os.path.normpath(file_path))
+
+    @staticmethod
+    def _get_signature(file_path: str) -> Tuple[int, int, int]:
+        """获取文件签名（大小、修改时间、inode）"""
+        stat = os.stat(file_path)
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def get(self, file_path: str, algorithms: Union[str, Iterable[str]] = 'xxhash') -> Dict[str, str]:
+        """读取缓存的哈希值（不计算缺失的哈希值）
+        :param file_path: 文件路径
+        :param algorithms: 算法名称或算法名称列表
+        :return: {算法名称: 哈希值}，仅包含有效缓存"""
+        algorithms = _normalize_algorithms(algorithms)
+        return self._get(self._get_key(file_path), self._get_signature(file_path), algorithms)
+
+    def _get(self, key: str, signature: Tuple[int, int, int], algorithms: list) -> Dict[str, str]:
+        """读取缓存的哈希值，同时作废签名不一致的记录"""
+        digests = {}
+        with self._lock:
+            rows = self._conn.execute('SELECT algorithm, size, mtime_ns, inode, digest FROM hashes WHERE path = ?',
+                                      (key,)).fetchall()
+            stale = False
+            for algorithm, size, mtime_ns, inode, digest in rows:
+                if (size, mtime_ns, inode) != signature:
+                    stale = True
+                elif algorithm in algorithms:
+                    digests[algorithm] = digest
+
+            if stale:  # 文件已变化，删除该路径的全部旧记录
+                self._conn.execute('DELETE FROM hashes WHERE path = ? AND (size != ? OR mtime_ns != ? OR inode != ?)',
+                                   (key, *signature))
+            if digests:
+                self._conn.execute(f'UPDATE hashes SET last_access = ? WHERE path = ? '
+                                   f'AND algorithm IN ({",".join("?" * len(digests))})',
+                                   (time.time(), key, *digests))
+            if stale or digests:
+                self._conn.commit()
+
+        return digests
+
+    def _put(self, key: str, signature: Tuple[int, int, int], digests: Dict[str, str]):
+        """写入哈希值"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany('INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                   [(key, algorithm, *signature, digest, now) for algorithm, digest in
+                                    digests.items()])
+            self._conn.commit()
+            self._write_count += len(digests)
+            need_evict = self._write_count >= self._EVICT_CHECK_INTERVAL
+            if need_evict:
+                self._write_count = 0
+
+        if need_evict:
+            self.evict()
+
+    def calc_hashes(self, file_path: str, algorithms: Union[str, Iterable[str]] = 'xxhash',
+                    block_size: int = _DEFAULT_BLOCK_SIZE) -> Dict[str, str]:
+        """计算文件哈希值，优先使用缓存，仅计算缺失的算法
+        :param file_path: 文件路径
+        :param algorithms: 算法名称或算法名称列表
+        :param block_size: 读取块大小
+        :return: {算法名称: 哈希值}"""
+        algorithms = _normalize_algorithms(algorithms)
+        key = self._get_key(file_path)
+        signature = self._get_signature(file_path)
+
+        digests = self._get(key, signature, algorithms)
+        missing = [i for i in algorithms if i not in digests]
+        if missing:
+            calculated = _calc_hashes(file_path, missing, block_size)
+            # 计算期间文件发生变化时不写入缓存
+            if self._get_signature(file_path) == signature:
+                self._put(key, signature, calculated)
+            digests.update(calculated)
+
+        return {algorithm: digests[algorithm] for algorithm in algorithms}
+
+    def iter_hashes_from_files(self, file_paths: Iterable[str], algorithms: Union[str, Iterable[str]] = 'xxhash',
+                               max_workers: int = None, block_size: int = _DEFAULT_BLOCK_SIZE
+                               ) -> Iterator[Tuple[str, Union[Dict[str, str], None]]]:
+        """批量计算文件哈希值，命中缓存的文件直接返回，其余文件使用线程池计算
+        :param file_paths: 文件路径列表
+        :param algorithms: 算法名称或算法名称列表
+        :param max_workers: 最大线程数
+        :param block_size: 读取块大小
+        :return: 生成器，(文件路径, {算法名称: 哈希值})，读取失败的文件哈希值为None"""
+        algorithms = _normalize_algorithms(algorithms)
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        max_pending = max_workers * 4  # 限制同时计算的文件数，防止文件数量过多时占用大量内存
+
+        def finish(futures) -> Iterator[Tuple[str, Union[Dict[str, str], None]]]:
+            """返回已完成的计算结果，并写入缓存"""
+            for future in futures:
+                file_path, signature = pending.pop(future)
+                try:
+                    digests = future.result()
+                except OSError as e:  # 文件不存在或被占用
+                    print(f'报错提示：{e}')
+                    yield file_path, None
+                    continue
+                try:
+                    # 计算期间文件发生变化时不写入缓存
+                    if self._get_signature(file_path) == signature:
+                        self._put(self._get_key(file_path), signature, digests)
+                except OSError:
+                    pass
+                yield file_path, digests
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}  # {任务: (文件路径, 文件签名)}
+            for file_path in file_paths:
+                # 命中缓存的文件直接返回
+                try:
+                    signature = self._get_signature(file_path)
+                except OSError:
+                    yield file_path, None
+                    continue
+                digests = self._get(self._get_key(file_path), signature, algorithms)
+                if len(digests) == len(algorithms):
+                    yield file_path, digests
+                    continue
+
+                # 未命中缓存的文件提交到线程池，达到上限时等待任一文件计算完成
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from finish(done)
+                pending[executor.submit(_calc_hashes, file_path, algorithms, block_size)] = (file_path, signature)
+                yield from finish([future for future in pending if future.done()])
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from finish(done)
+
+    def evict(self, max_entries: int = None) -> int:
+        """按最近访问时间淘汰旧记录，使缓存条数不超过上限
+        :param max_entries: 最大缓存条数，默认使用初始化时设置的值
+        :return: 删除的记录数"""
+        if max_entries is None:
+            max_entries = self.max_entries
+        if not max_entries:
+            return 0
+
+        with self._lock:
+            count = self._conn.execute('SELECT COUNT(*) FROM hashes').fetchone()[0]
+            overflow = count - max_entries
+            if overflow <= 0:
+                return 0
+            self._conn.execute('DELETE FROM hashes WHERE rowid IN '
+                               '(SELECT rowid FROM hashes ORDER BY last_access LIMIT ?)', (overflow,))
+            self._conn.commit()
+
+        return overflow
+
+    def compact(self) -> int:
+        """压缩缓存：删除已不存在或已变化的文件记录，淘汰超限记录，并回收数据库空间
+        :return: 删除的记录数"""
+        with self._lock:
+            rows = self._conn.execute('SELECT DISTINCT path, size, mtime_ns, inode FROM hashes').fetchall()
+
+        stale_rows = []
+        for path, size, mtime_ns, inode in rows:
+            try:
+                if self._get_signature(path) != (size, mtime_ns, inode):
+                    stale_rows.append((path, size, mtime_ns, inode))
+            except OSError:
+                stale_rows.append((path, size, mtime_ns, inode))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany('DELETE FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?',
+                                   stale_rows)
+            self._conn.commit()
+            deleted = self._conn.total_changes - before
+
+        deleted += self.evict()
+
+        with self._lock:
+            self._conn.execute('VACUUM')
+
+        return deleted
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute('DELETE FROM hashes')
+            self._conn.commit()
+            self._conn.execute('VACUUM')
@@ -0,0 +1,156 @@
+import json
+import os
+from typing import Callable, List
+
+from ._hash import _create_hasher, _DEFAULT_BLOCK_SIZE
+
+# 默认分段大小（256MB），每完成一个分段保存一次断点
+_DEFAULT_SEGMENT_SIZE = 268435456
+
+
+class ResumableHasher:
+    """可断点续算的文件列表哈希计算器
+    将文件列表视为一个连续的数据流，按固定大小分段计算哈希值，每完成一个分段将进度写入断点文件，
+    中断后重新运行时从最后一个完成的分段继续计算。
+    由于hashlib/xxhash的哈希对象不支持序列化，最终结果为所有分段哈希值拼接后再计算的哈希值（哈希列表），
+    与calc_xxhash_from_files的结果不同，但对相同的文件列表与分段大小结果固定。
+    :param file_paths: 文件路径列表
+    :param checkpoint_path: 断点文件路径
+    :param algorithm: 算法名称
+    :param segment_size: 分段大小（字节）
+    :param block_size: 读取块大小
+    """
+
+    def __init__(self, file_paths: List[str], checkpoint_path: str, algorithm: str = 'xxhash',
+                 segment_size: int = _DEFAULT_SEGMENT_SIZE, block_size: int = _DEFAULT_BLOCK_SIZE):
+        if segment_size <= 0:
+            raise Exception(f'分段大小错误：{segment_size}')
+
+        self.file_paths = [os.path.abspath(os.path.normpath(i)) for i in file_paths]
+        self.checkpoint_path = checkpoint_path
+        self.algorithm = algorithm.lower()
+        self.segment_size = segment_size
+        self.block_size = min(block_size, segment_size)
+
+        self._file_signatures = self._get_file_signatures()
+        self.total_size = sum(i[1] for i in self._file_signatures)
+        self.offset = 0  # 已完成分段的数据总长度
+        self.segment_digests = []  # 已完成分段的哈希值
+
+        self._load_checkpoint()
+
+    def _get_file_signatures(self) -> list:
+        """获取文件签名列表（路径、大小、修改时间），用于校验断点是否仍然有效"""
+        signatures = []
+        for file_path in self.file_paths:
+            stat = os.stat(file_path)
+            signatures.append([file_path, stat.st_size, stat.st_mtime_ns])
+        return signatures
+
+    def _load_checkpoint(self):
+        """读取断点文件，参数或文件发生变化时丢弃断点"""
+        if not os.path.exists(self.checkpoint_path):
+            return
+
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'报错提示：{e}')
+            return
+
+        if (checkpoint.get('algorithm') != self.algorithm
+                or checkpoint.get('segment_size') != self.segment_size
+                or checkpoint.get('files') != self._file_signatures):
+            return
+
+        self.offset = checkpoint['offset']
+        self.segment_digests = checkpoint['segment_digests']
+
+    def _save_checkpoint(self):
+        """保存断点文件（先写入临时文件再替换，防止写入中断导致断点文件损坏）"""
+        checkpoint = {'algorithm': self.algorithm,
+                      'segment_size': self.segment_size,
+                      'files': self._file_signatures,
+                      'offset': self.offset,
+                      'segment_digests': self.segment_digests}
+        temp_path = f'{self.checkpoint_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.checkpoint_path)
+
+    def _iter_chunks(self, start_offset: int):
+        """从数据流的指定位置开始逐块读取数据"""
+        buffer = bytearray(self.block_size)
+        view = memoryview(buffer)
+        file_start = 0
+        try:
+            for file_path, file_size, _ in self._file_signatures:
+                file_end = file_start + file_size
+                if file_end > start_offset:
+                    with open(file_path, 'rb') as f:
+                        f.seek(max(start_offset - file_start, 0))
+                        while size := f.readinto(buffer):
+                            yield view[:size]
+                file_start = file_end
+        finally:
+            view.release()
+
+    def is_finished(self) -> bool:
+        """是否已完成全部分段的计算"""
+        return self.offset >= self.total_size and bool(self.segment_digests or not self.total_size)
+
+    def run(self, progress_callback: Callable[[int, int], None] = None, remove_checkpoint: bool = True) -> str:
+        """开始/继续计算
+        :param progress_callback: 每完成一个分段时调用，传入(已完成字节数, 总字节数)
+        :param remove_checkpoint: 计算完成后是否删除断点文件
+        :return: 哈希值"""
+        if self._get_file_signatures() != self._file_signatures:
+            raise Exception('计算期间文件发生变化')
+
+        hasher = _create_hasher(self.algorithm)
+        segment_length = 0
+        for chunk in self._iter_chunks(self.offset):
+            # 数据块可能跨越分段边界，需要拆分
+            while chunk:
+                size = min(len(chunk), self.segment_size - segment_length)
+                hasher.update(chunk[:size])
+                chunk = chunk[size:]
+                segment_length += size
+
+                if segment_length == self.segment_size:
+                    self._finish_segment(hasher, segment_length, progress_callback)
+                    hasher = _create_hasher(self.algorithm)
+                    segment_length = 0
+
+        if segment_length or not self.segment_digests:  # 最后一个不完整的分段（或空数据）
+            self._finish_segment(hasher, segment_length, progress_callback)
+
+        if self.offset != self.total_size:
+            raise Exception('计算期间文件发生变化')
+
+        digest = self.get_digest()
+        if remove_checkpoint and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        return digest
+
+    def _finish_segment(self, hasher, segment_length: int, progress_callback: Callable[[int, int], None] = None):
+        """完成一个分段，保存断点"""
+        self.segment_digests.append(hasher.hexdigest())
+        self.offset += segment_length
+        self._save_checkpoint()
+        if progress_callback:
+            progress_callback(self.offset, self.total_size)
+
+    def get_digest(self) -> str:
+        """获取最终哈希值（所有分段哈希值拼接后计算的哈希值）"""
+        if not self.is_finished():
+            raise Exception('计算未完成')
+
+        hasher = _create_hasher(self.algorithm)
+        for segment_digest in self.segment_digests:
+            hasher.update(bytes.fromhex(segment_digest))
+        return hasher.hexdigest()
@@ -1,11 +1,22 @@
 import os
-from typing import Union
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Iterator, Tuple, Iterable, Dict
 
 import filetype
 import win32com.client  # pywin32
-from natsort import natsort
 
 from ._filepath import remove_subpaths
+from ._sort import _sort_paths_by
+
+# 判断文件类型时读取的文件头字节数（与filetype库一致）
+_FILETYPE_HEADER_SIZE = 8192
+# 文件类型缓存的最大条数
+_FILETYPE_CACHE_SIZE = 65536
+_FILETYPE_CACHE = OrderedDict()  # {文件路径: (修改时间, 文件大小, 文件类型)}
+_FILETYPE_CACHE_LOCK = threading.Lock()
 
 """----------逻辑函数----------"""
 
@@ -25,77 +36,220 @@ def _get_size(path: str) -> int:
         return 0
 
 
+def _scan_dir_entries(dirpath: str) -> Union[list, None]:
+    """读取文件夹的下级文件/文件夹（仅第1层，使用os.scandir缓存的文件类型与stat结果）
+    :param dirpath: 文件夹路径（需已规范化）
+    :return: [(路径, 是否为文件夹, 文件大小, 是否需要进入该文件夹)]，无法访问时返回None"""
+    try:
+        with os.scandir(dirpath) as entries:
+            entries = list(entries)
+    except OSError:  # 与os.walk一致，忽略无法访问的文件夹
+        return None
+
+    results = []
+    for entry in entries:
+        path = os.path.normpath(entry.path)
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            # 与os.walk一致，不进入符号链接指向的文件夹
+            results.append((path, True, 0, not entry.is_symlink()))
+        else:
+            try:
+                size = entry.stat().st_size  # Windows下scandir已缓存stat结果，不产生额外的系统调用
+            except OSError:  # 失效的符号链接
+                size = 0
+            results.append((path, False, size, False))
+
+    return results
+
+
+def _walk_dir(dirpath: str) -> Iterator[Tuple[str, bool, int]]:
+    """遍历文件夹（使用os.scandir，复用目录项缓存的文件类型与stat结果，一次遍历同时获取文件、文件夹和文件大小）
+    遍历顺序与os.walk一致：先返回文件夹的下级文件/文件夹，再依次进入各子文件夹
+    :param dirpath: 文件夹路径
+    :return: 生成器，(路径, 是否为文件夹, 文件大小)，文件夹的大小为0"""
+    stack = [os.path.normpath(dirpath)]
+    while stack:
+        entries = _scan_dir_entries(stack.pop())
+        if entries is None:
+            continue
+
+        child_dirpaths = []
+        for path, is_dir, size, need_walk in entries:
+            yield path, is_dir, size
+            if need_walk:
+                child_dirpaths.append(path)
+
+        stack.extend(reversed(child_dirpaths))
+
+
 def _get_dir_size(dirpath: str) -> int:
     """获取指定文件夹的总大小（字节byte）
     :param dirpath: 文件夹路径
     :return: 总大小（字节byte）"""
-    _folder_size = 0
-    for _dirpath, dirnames, filenames in os.walk(dirpath):
-        for item in filenames:
-            filepath = os.path.join(_dirpath, item)
-            _folder_size += os.path.getsize(filepath)
-
-    return _folder_size
+    return sum(size for _, is_dir, size in _walk_dir(dirpath) if not is_dir)
 
 
 def _get_files_in_dir(dirpath: str) -> list:
     """获取文件夹中所有文件的路径
     :param dirpath: 文件夹路径"""
-    files = []
-    for _dirpath, dirnames, filenames in os.walk(dirpath):
-        for filename in filenames:
-            filepath_join = os.path.normpath(os.path.join(_dirpath, filename))
-            files.append(filepath_join)
+    return [path for path, is_dir, _ in _walk_dir(dirpath) if not is_dir]
 
-    return files
 
-
-def _get_files_in_paths(paths: list) -> list:
+def _normalize_extensions(extensions: Union[str, Iterable[str], None]) -> Union[set, None]:
+    """规范化文件扩展名列表（转小写，去除.）"""
+    if extensions is None:
+        return None
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    return {i.strip().strip('.').lower() for i in extensions}
+
+
+def _filter_files(files: Iterable[Tuple[str, int]], extensions: Union[str, Iterable[str]] = None,
+                  min_size: int = None, max_size: int = None,
+                  filetypes: Union[str, Iterable[str]] = None) -> Iterator[str]:
+    """按条件筛选文件（按扩展名、大小、文件类型的顺序判断，需要读取文件头的文件类型判断放在最后）
+    :param files: (文件路径, 文件大小)
+    :param extensions: 文件扩展名列表
+    :param min_size: 最小文件大小（字节）
+    :param max_size: 最大文件大小（字节）
+    :param filetypes: 文件类型列表（通过文件头判断）
+    :return: 生成器，符合条件的文件路径"""
+    extensions = _normalize_extensions(extensions)
+    filetypes = _normalize_extensions(filetypes)
+
+    for filepath, size in files:
+        if extensions is not None and os.path.splitext(filepath)[1].strip('.').lower() not in extensions:
+            continue
+        if min_size is not None and size < min_size:
+            continue
+        if max_size is not None and size > max_size:
+            continue
+        if filetypes is not None and _guess_filetype(filepath) not in filetypes:
+            continue
+        yield filepath
+
+
+def _iter_files_in_dir(dirpath: str, extensions: Union[str, Iterable[str]] = None, min_size: int = None,
+                       max_size: int = None, filetypes: Union[str, Iterable[str]] = None,
+                       sort: Union[bool, str] = False) -> Iterator[str]:
+    """逐个返回文件夹中的文件路径（遍历过程中立即返回，不保存完整列表）
+    :param dirpath: 文件夹路径
+    :param extensions: 筛选的文件扩展名列表
+    :param min_size: 筛选的最小文件大小（字节）
+    :param max_size: 筛选的最大文件大小（字节）
+    :param filetypes: 筛选的文件类型列表（通过文件头判断）
+    :param sort: 是否排序（需要先获取全部结果），True或'os'使用natsort.os_sorted，'natural'使用更快的sort_paths
+    :return: 生成器，文件路径"""
+    files = ((path, size) for path, is_dir, size in _walk_dir(dirpath) if not is_dir)
+    files = _filter_files(files, extensions, min_size, max_size, filetypes)
+    if sort:
+        files = _sort_paths_by(files, 'os' if sort is True else sort)
+
+    yield from files
+
+
+def _iter_files_in_paths(paths: list, extensions: Union[str, Iterable[str]] = None, min_size: int = None,
+                         max_size: int = None, filetypes: Union[str, Iterable[str]] = None,
+                         sort: Union[bool, str] = False) -> Iterator[str]:
+    """逐个返回输入路径列表中的文件路径（遍历过程中立即返回，不保存完整列表）
+    :param paths: 文件/文件夹路径列表
+    :param extensions: 筛选的文件扩展名列表
+    :param min_size: 筛选的最小文件大小（字节）
+    :param max_size: 筛选的最大文件大小（字节）
+    :param filetypes: 筛选的文件类型列表（通过文件头判断）
+    :param sort: 是否排序（需要先获取全部结果），True或'os'使用natsort.os_sorted，'natural'使用更快的sort_paths
+    :return: 生成器，文件路径"""
+
+    def iter_files():
+        # 删除路径中的子路径及重复路径，剩余路径之间不会包含相同的文件，无需再对结果去重
+        for path in dict.fromkeys(remove_subpaths(paths)):
+            if os.path.isfile(path):
+                yield path, os.path.getsize(path)
+            elif os.path.isdir(path):
+                for child_path, is_dir, size in _walk_dir(path):
+                    if not is_dir:
+                        yield child_path, size
+
+    files = _filter_files(iter_files(), extensions, min_size, max_size, filetypes)
+    if sort:
+        files = _sort_paths_by(files, 'os' if sort is True else sort)
+
+    yield from files
+
+
+def _get_files_in_paths(paths: list, sort: str = 'os') -> list:
     """提取输入路径列表中所有文件路径"""
-    # 删除路径中的子路径
-    paths = remove_subpaths(paths)
-
-    # 提取路径中的文件
-    files = set()
-    for path in paths:
-        if os.path.isfile(path):
-            files.add(path)
-        elif os.path.isdir(path):
-            child_files = get_files_in_dir(path)
-            files.update(child_files)
-
-    files = natsort.os_sorted(files)
-    return files
+    return list(_iter_files_in_paths(paths, sort=sort))
 
 
 def _get_folders_in_dir(dirpath: str) -> list:
     """获取文件夹中所有文件夹的路径
     :param dirpath: 文件夹路径"""
-    folders = []
-    for _dirpath, dirnames, filenames in os.walk(dirpath):
-        for dirname in dirnames:
-            filepath_join = os.path.normpath(os.path.join(_dirpath, dirname))
-            folders.append(filepath_join)
+    return [path for path, is_dir, _ in _walk_dir(dirpath) if is_dir]
 
-    return folders
 
-
-def _guess_filetype(path) -> Union[str, None]:
-    """判断文件类型
-    :param path: 文件路径"""
-    if not os.path.isfile(path):
+def _guess_filetype(path, use_cache: bool = True) -> Union[str, None]:
+    """判断文件类型（只读取一次文件头，结果按文件路径+修改时间+文件大小缓存）
+    :param path: 文件路径
+    :param use_cache: 是否使用缓存"""
+    try:
+        file_stat = os.stat(path)
+    except OSError:
         return None
-
-    kind = filetype.guess(path)
-    if kind is None:
+    if not stat.S_ISREG(file_stat.st_mode):
         return None
 
-    type_ = kind.extension
-    if type_:
-        return type_
-    else:
+    path = os.path.normpath(path)
+    signature = (file_stat.st_mtime_ns, file_stat.st_size)
+    if use_cache:
+        with _FILETYPE_CACHE_LOCK:
+            cached = _FILETYPE_CACHE.get(path)
+            if cached is not None and cached[:2] == signature:
+                _FILETYPE_CACHE.move_to_end(path)
+                return cached[2]
+
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(_FILETYPE_HEADER_SIZE)
+    except OSError:
         return None
 
+    kind = filetype.guess(header)
+    type_ = kind.extension if kind is not None and kind.extension else None
+
+    if use_cache:
+        with _FILETYPE_CACHE_LOCK:
+            _FILETYPE_CACHE[path] = (*signature, type_)
+            _FILETYPE_CACHE.move_to_end(path)
+            while len(_FILETYPE_CACHE) > _FILETYPE_CACHE_SIZE:
+                _FILETYPE_CACHE.popitem(last=False)
+
+    return type_
+
+
+def _guess_filetypes(paths: Iterable[str], max_workers: int = None,
+                     use_cache: bool = True) -> Dict[str, Union[str, None]]:
+    """使用线程池批量判断文件类型（每个文件只读取一次文件头）
+    :param paths: 文件路径列表
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :param use_cache: 是否使用缓存
+    :return: {文件路径: 文件类型}"""
+    paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        types = executor.map(lambda path: _guess_filetype(path, use_cache), paths)
+        return dict(zip(paths, types))
+
+
+def _clear_filetype_cache():
+    """清空文件类型缓存"""
+    with _FILETYPE_CACHE_LOCK:
+        _FILETYPE_CACHE.clear()
+
 
 def _get_first_multi_file_dirpath(dirpath: str) -> str:
     """找出文件夹中首个含多个下级文件/文件夹的文件夹路径（用于解除套娃文件夹）
@@ -134,6 +288,13 @@ def _get_shortcut_target_path(shortcut_path: str) -> str:
 """----------调用函数----------"""
 
 
+def walk_dir(dirpath: str) -> Iterator[Tuple[str, bool, int]]:
+    """遍历文件夹，一次遍历同时获取文件、文件夹和文件大小（遍历顺序与os.walk一致）
+    :param dirpath: 文件夹路径
+    :return: 生成器，(路径, 是否为文件夹, 文件大小)，文件夹的大小为0"""
+    return _walk_dir(dirpath)
+
+
 def get_size(path: str) -> int:
     """获取指定文件/文件夹的总大小（字节byte）
     :param path: 文件/文件夹路径
@@ -154,9 +315,39 @@ def get_files_in_dir(dirpath: str) -> list:
     return _get_files_in_dir(dirpath)
 
 
-def get_files_in_paths(paths: list) -> list:
-    """提取输入路径列表中所有文件路径"""
-    return _get_files_in_paths(paths)
+def get_files_in_paths(paths: list, sort: str = 'os') -> list:
+    """提取输入路径列表中所有文件路径
+    :param paths: 文件/文件夹路径列表
+    :param sort: 排序方式，'os'使用natsort.os_sorted，'natural'使用更快的sort_paths"""
+    return _get_files_in_paths(paths, sort)
+
+
+def iter_files_in_dir(dirpath: str, extensions: Union[str, Iterable[str]] = None, min_size: int = None,
+                      max_size: int = None, filetypes: Union[str, Iterable[str]] = None,
+                      sort: Union[bool, str] = False) -> Iterator[str]:
+    """逐个返回文件夹中的文件路径（遍历过程中立即返回，不保存完整列表）
+    :param dirpath: 文件夹路径
+    :param extensions: 筛选的文件扩展名列表
+    :param min_size: 筛选的最小文件大小（字节）
+    :param max_size: 筛选的最大文件大小（字节）
+    :param filetypes: 筛选的文件类型列表（通过文件头判断）
+    :param sort: 是否排序（需要先获取全部结果），True或'os'使用natsort.os_sorted，'natural'使用更快的sort_paths
+    :return: 生成器，文件路径"""
+    return _iter_files_in_dir(dirpath, extensions, min_size, max_size, filetypes, sort)
+
+
+def iter_files_in_paths(paths: list, extensions: Union[str, Iterable[str]] = None, min_size: int = None,
+                        max_size: int = None, filetypes: Union[str, Iterable[str]] = None,
+                        sort: Union[bool, str] = False) -> Iterator[str]:
+    """逐个返回输入路径列表中的文件路径（遍历过程中立即返回，不保存完整列表）
+    :param paths: 文件/文件夹路径列表
+    :param extensions: 筛选的文件扩展名列表
+    :param min_size: 筛选的最小文件大小（字节）
+    :param max_size: 筛选的最大文件大小（字节）
+    :param filetypes: 筛选的文件类型列表（通过文件头判断）
+    :param sort: 是否排序（需要先获取全部结果），True或'os'使用natsort.os_sorted，'natural'使用更快的sort_paths
+    :return: 生成器，文件路径"""
+    return _iter_files_in_paths(paths, extensions, min_size, max_size, filetypes, sort)
 
 
 def get_folders_in_dir(dirpath: str) -> list:
@@ -165,10 +356,26 @@ def get_folders_in_dir(dirpath: str) -> list:
     return _get_folders_in_dir(dirpath)
 
 
-def guess_filetype(path) -> Union[str, None]:
-    """判断文件类型
-    :param path: 文件路径"""
-    return _guess_filetype(path)
+def guess_filetype(path, use_cache: bool = True) -> Union[str, None]:
+    """判断文件类型（只读取一次文件头，结果按文件路径+修改时间+文件大小缓存）
+    :param path: 文件路径
+    :param use_cache: 是否使用缓存"""
+    return _guess_filetype(path, use_cache)
+
+
+def guess_filetypes(paths: Iterable[str], max_workers: int = None,
+                    use_cache: bool = True) -> Dict[str, Union[str, None]]:
+    """使用线程池批量判断文件类型（每个文件只读取一次文件头）
+    :param paths: 文件路径列表
+    :param max_workers: 最大线程数，默认为CPU核心数+4（最多32）
+    :param use_cache: 是否使用缓存
+    :return: {文件路径: 文件类型}"""
+    return _guess_filetypes(paths, max_workers, use_cache)
+
+
+def clear_filetype_cache():
+    """清空文件类型缓存"""
+    _clear_filetype_cache()
 
 
 def get_first_multi_file_dirpath(dirpath: str) -> str:
@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+from typing import Iterable
+
+from ._snapshot import DirSnapshot
+
+try:  # 可选依赖，未安装时只能使用轮询模式
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    """将watchdog事件转换为发生变化的文件夹路径"""
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def on_any_event(self, event):
+        if event.event_type in ('opened', 'closed_no_write'):  # 只读事件，不影响索引
+            return
+
+        # 文件/文件夹变化时，其所在的文件夹的下级列表或文件大小发生变化
+        paths = [event.src_path, os.path.dirname(event.src_path)]
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            paths.append(os.path.dirname(dest_path))
+        if event.is_directory and event.event_type == 'modified':
+            paths = [event.src_path]
+        self.callback(paths)
+
+
+class LiveDirIndex:
+    """实时更新的文件夹索引，在内存中维护文件夹大小、文件列表及空文件夹状态
+    使用watchdog监听文件系统事件（未安装watchdog时使用轮询），事件经过防抖后批量更新索引，
+    查询文件夹大小、是否为空文件夹时直接读取索引，不再遍历文件夹
+    :param dirpath: 文件夹路径
+    :param backend: 'auto' 自动选择，'watchdog' 监听文件系统事件，'polling' 定时重新读取所有文件夹
+    :param debounce: 防抖时间（秒），连续的事件在停止该时长后统一更新
+    :param max_delay: 最长延迟（秒），持续有事件时也会在该时长后更新一次
+    :param poll_interval: 轮询模式的检查间隔（秒）
+    """
+
+    def __init__(self, dirpath: str, backend: str = 'auto', debounce: float = 0.5, max_delay: float = 5.0,
+                 poll_interval: float = 2.0):
+        if backend == 'auto':
+            backend = 'watchdog' if Observer is not None else 'polling'
+        if backend == 'watchdog' and Observer is None:
+            raise Exception('未安装watchdog，无法使用watchdog模式')
+        if backend not in ('watchdog', 'polling'):
+            raise Exception(f'不支持的监听模式：{backend}')
+
+        self.backend = backend
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+
+        self.snapshot = DirSnapshot(dirpath)
+        self.dirpath = self.snapshot.dirpath
+
+        self._lock = threading.RLock()  # 保护索引数据
+        self._condition = threading.Condition()  # 保护待更新的文件夹
+        self._dirty_dirs = set()  # 待更新的文件夹
+        self._first_event_time = None
+        self._last_event_time = None
+        self._running = False
+        self._thread = None
+        self._observer = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """开始监听并建立初始索引"""
+        self._running = True
+        if self.backend == 'watchdog':
+            # 先开始监听再扫描，扫描期间发生的变化会被记录，扫描完成后统一更新
+            self._observer = Observer()
+            self._observer.schedule(_WatchdogHandler(self._mark_dirty), self.dirpath, recursive=True)
+            self._observer.start()
+
+        with self._lock:
+            self.snapshot.scan()
+
+        if self.backend == 'watchdog':
+            self.flush()
+            self._thread = threading.Thread(target=self._run_debounce, daemon=True)
+        else:
+            self._thread = threading.Thread(target=self._run_polling, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止监听"""
+        with self._condition:  # 在锁内修改状态，防止线程检查状态后、等待前错过通知
+            self._running = False
+            self._condition.notify_all()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _mark_dirty(self, paths: Iterable[str]):
+        """记录发生变化的文件夹（不在索引中的路径在更新时忽略，新文件夹由其父文件夹的更新处理）"""
+        with self._condition:
+            now = time.monotonic()
+            for path in paths:
+                self._dirty_dirs.add(os.path.normpath(path))
+            if self._first_event_time is None:
+                self._first_event_time = now
+            self._last_event_time = now
+            self._condition.notify_all()
+
+    def _run_debounce(self):
+        """防抖线程：事件停止debounce秒或累计max_delay秒后，批量更新索引"""
+        while True:
+            with self._condition:
+                # 在锁内检查状态，stop()的通知不会在检查后、等待前丢失
+                while self._running and not self._dirty_dirs:
+                    self._condition.wait()
+                if not self._running:
+                    return
+
+                now = time.monotonic()
+                wait_time = min(self._last_event_time + self.debounce, self._first_event_time + self.max_delay) - now
+                if wait_time > 0:
+                    self._condition.wait(wait_time)
+                    continue
+
+            try:  # 更新出错时不中断防抖线程，后续事件仍可继续更新
+                self.flush()
+            except Exception as e:
+                print(f'报错提示：{e}')
+
+    def _run_polling(self):
+        """轮询线程：定时重新读取所有文件夹，更新索引"""
+        while True:
+            with self._condition:
+                if self._running:
+                    self._condition.wait(self.poll_interval)
+                if not self._running:
+                    return
+
+            try:  # 读取出错时不中断轮询线程，下次轮询时重试
+                self.poll()
+            except Exception as e:
+                print(f'报错提示：{e}')
+
+    def flush(self):
+        """立即处理所有待更新的文件夹"""
+        with self._condition:
+            dirty_dirs = self._dirty_dirs
+            self._dirty_dirs = set()
+            self._first_event_time = None
+            self._last_event_time = None
+
+        if dirty_dirs:
+            with self._lock:
+                self.snapshot.refresh(dirty_dirs)
+
+    def poll(self):
+        """重新读取所有文件夹并更新索引（轮询模式使用，也可手动调用）
+        文件内容变化不会改变文件夹的修改时间，因此不复用快照中的下级列表，以获取最新的文件大小"""
+        with self._lock:
+            self.snapshot.scan(verify_files=True)
+
+    def get_dir_size(self, dirpath: str = None) -> int:
+        """获取文件夹的总大小（字节byte）
+        :param dirpath: 文件夹路径，默认为索引的根文件夹"""
+        with self._lock:
+            return self.snapshot.get_dir_size(dirpath)
+
+    def is_empty_folder(self, dirpath: str = None) -> bool:
+        """文件夹是否为空文件夹（不含任何文件）
+        :param dirpath: 文件夹路径，默认为索引的根文件夹"""
+        with self._lock:
+            return self.snapshot.is_empty_folder(dirpath)
+
+    def get_files_in_dir(self, dirpath: str = None) -> list:
+        """获取文件夹中所有文件的路径
+        :param dirpath: 文件夹路径，默认为索引的根文件夹"""
+        with self._lock:
+            return self.snapshot.get_files_in_dir(dirpath)
+
+    def get_folders_in_dir(self, dirpath: str = None) -> list:
+        """获取文件夹中所有文件夹的路径
+        :param dirpath: 文件夹路径，默认为索引的根文件夹"""
+        with self._lock:
+            return self.snapshot.get_folders_in_dir(dirpath)
+
+    def find_empty_folder(self, dirpath: str = None, sort: str = 'os') -> list:
+        """搜索文件夹中的空文件夹（及其自身）
+        :param dirpath: 文件夹路径，默认为索引的根文件夹
+        :param sort: 排序方式，'os'使用natsort.os_sorted，'natural'使用更快的sort_paths"""
+        with self._lock:
+            return self.snapshot.find_empty_folder(dirpath, sort)
@@ -2,14 +2,16 @@ import os
 import shutil
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Iterable, Dict, Union
 
-import natsort
 import send2trash
 
-from ._filename import create_nodup_filename_standard_digital_suffix
-from ._filepath import split_path
+from ._filename import create_nodup_filename_standard_digital_suffix, NameAllocator
+from ._filepath import split_path, remove_subpaths
 from ._info import get_first_multi_file_dirpath
-from ..common import create_random_string
+from ._sort import _sort_paths_by
+from ..common import create_random_strings
 
 """----------逻辑函数----------"""
 
@@ -35,31 +37,121 @@ def _delete(path: str, send_to_trash: bool = False) -> bool:
     return False
 
 
-def _find_empty_folder(dirpath: str) -> list:
+def _delete_paths_to_trash(paths: list, report: dict):
+    """批量删除至回收站，批量删除失败时逐个删除以确定失败的路径"""
+    try:
+        send2trash.send2trash(paths)
+        report['deleted'].extend(paths)
+        return
+    except Exception as e:
+        if len(paths) == 1:
+            report['failed'][paths[0]] = str(e)
+            return
+
+    for path in paths:
+        if not os.path.lexists(path):  # 批量删除中断前已移至回收站
+            report['deleted'].append(path)
+            continue
+        try:
+            send2trash.send2trash(path)
+            report['deleted'].append(path)
+        except Exception as e:
+            report['failed'][path] = str(e)
+
+
+def _delete_paths_permanently(paths: list, report: dict, max_workers: int = None):
+    """并行删除文件，再自下而上删除文件夹"""
+    # 展开文件夹：文件（及指向文件夹的符号链接）并行删除，文件夹在其内部文件删除后自下而上删除
+    files = {}  # {文件路径: 所属的传入路径}
+    dirs = []  # (文件夹路径, 所属的传入路径)，子文件夹在前
+    for path in paths:
+        if os.path.isdir(path) and not os.path.islink(path):
+            for _dirpath, dirnames, filenames in os.walk(path, topdown=False):
+                for name in filenames:
+                    files[os.path.join(_dirpath, name)] = path
+                for name in dirnames:
+                    child_path = os.path.join(_dirpath, name)
+                    if os.path.islink(child_path):
+                        files[child_path] = path
+                dirs.append((_dirpath, path))
+        else:
+            files[path] = path
+
+    errors = {}  # {传入路径: 首个错误信息}
+
+    def remove_file(filepath: str):
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
+        except OSError as e:  # 文件被占用或无权限
+            errors.setdefault(files[filepath], str(e))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(remove_file, files))
+
+    for _dirpath, path in dirs:
+        if path in errors:  # 内部有文件删除失败，文件夹必定非空
+            continue
+        try:
+            os.rmdir(_dirpath)
+        except OSError as e:
+            errors.setdefault(path, str(e))
+
+    for path in paths:
+        if path in errors:
+            report['failed'][path] = errors[path]
+        else:
+            report['deleted'].append(path)
+
+
+def _delete_paths(paths: Iterable[str], send_to_trash: bool = False, max_workers: int = None) -> Dict[str, list]:
+    """批量删除文件/文件夹（剔除重复路径与已包含在其他路径中的子路径）
+    :param paths: 需要删除的路径列表
+    :param send_to_trash: 是否删除至回收站（批量移至回收站）
+    :param max_workers: 永久删除时的最大线程数
+    :return: 删除结果，{'deleted': [成功删除的路径], 'failed': {删除失败的路径: 错误信息}, 'missing': [不存在的路径]}"""
+    report = {'deleted': [], 'failed': {}, 'missing': []}
+
+    existing_paths = []
+    for path in dict.fromkeys(remove_subpaths(paths)):
+        if os.path.lexists(path):
+            existing_paths.append(path)
+        else:
+            report['missing'].append(path)
+
+    if existing_paths:
+        if send_to_trash:
+            _delete_paths_to_trash(existing_paths, report)
+        else:
+            _delete_paths_permanently(existing_paths, report, max_workers)
+
+    return report
+
+
+def _iter_empty_folders(dirpath: str) -> Iterator[str]:
+    """自下而上遍历一次文件夹，逐个返回空文件夹（子文件夹先于父文件夹返回）
+    文件夹中没有文件，且所有子文件夹都是空文件夹时，视为空文件夹
+    :param dirpath: 文件夹路径
+    :return: 生成器，空文件夹路径"""
+    empty_folders = set()
+    for _dirpath, dirnames, filenames in os.walk(dirpath, topdown=False):
+        if filenames:
+            continue
+        _dirpath = os.path.normpath(_dirpath)
+        # 无法访问或未进入的子文件夹（符号链接）不在集合中，视为非空
+        if all(os.path.join(_dirpath, dirname) in empty_folders for dirname in dirnames):
+            empty_folders.add(_dirpath)
+            yield _dirpath
+
+
+def _find_empty_folder(dirpath: str, sort: str = 'os') -> list:
     """搜索指定文件夹中的空文件夹（及其自身）
     :param dirpath: 文件夹路径
+    :param sort: 排序方式，'os'使用natsort.os_sorted，'natural'使用更快的sort_paths
     :return: 搜索到的空文件夹路径
     """
-    # 提取所有文件夹路径（优先遍历子目录）
-    _dirpaths = []
-    for _dirpath, dirnames, filenames in os.walk(dirpath, topdown=False):
-        _dirpaths.append(_dirpath)
-    _dirpaths.append(dirpath)  # 将其自身放于末尾
-
-    # 从子目录开始逐级搜索空文件夹
-    empty_folders = []
-    for dirpath_check in _dirpaths:
-        child_filenames = os.listdir(dirpath_check)
-        # 如果为空，则直接判断为空文件夹
-        if not child_filenames:
-            empty_folders.append(os.path.normpath(dirpath_check))
-        # 如果不为空，需要考虑子文件夹为空文件夹的情况
-        else:
-            child_paths = [os.path.normpath(os.path.join(dirpath_check, i)) for i in child_filenames]
-            if set(child_paths) & set(empty_folders) == set(child_paths):  # 如果子文件/子文件夹都为空文件夹
-                empty_folders.append(os.path.normpath(dirpath_check))
-
-    empty_folders = natsort.os_sorted(empty_folders)
+    empty_folders = _sort_paths_by(_iter_empty_folders(dirpath), sort)
 
     return empty_folders
 
@@ -70,20 +162,25 @@ def _delete_empty_folder(dirpath: str, send_to_trash: bool = True) -> list:
     :param send_to_trash: 是否删除至回收站
     :return: 删除的文件夹路径
     """
-    empty_folders = _find_empty_folder(dirpath)
+    empty_folders = list(_iter_empty_folders(dirpath))  # 子文件夹在前，父文件夹在后
 
     deleted_paths = []
 
     if send_to_trash:
-        for empty_folder in empty_folders:
-            if os.path.exists(empty_folder):
-                send2trash.send2trash(empty_folder)
-                deleted_paths.append(empty_folder)
+        # 只需要删除最上级的空文件夹，其下级空文件夹会一起移至回收站
+        empty_set = set(empty_folders)
+        root = os.path.normpath(dirpath)
+        top_folders = [i for i in empty_folders if i == root or os.path.dirname(i) not in empty_set]
+        if top_folders:
+            send2trash.send2trash(top_folders)
+            deleted_paths.extend(top_folders)
     else:
         for empty_folder in empty_folders:
-            if os.path.exists(empty_folder):
+            try:
                 os.rmdir(empty_folder)
                 deleted_paths.append(empty_folder)
+            except OSError as e:  # 文件夹被占用，或遍历后新增了文件
+                print(f'报错提示：{e}')
 
     return deleted_paths
 
@@ -137,7 +234,8 @@ def _release_nesting_folder(check_path: str, target_dirpath: str) -> str:
     if nodup_filename == _origin_filename:  # 如果该文件名与原文件名一致，则不需要进行重命名
         pass
     else:  # 否则，先重命名为随机文件名（防止同目录存在重复文件名）
-        _random_filename = f'{create_random_string()}.{create_random_string(4)}'
+        _random_filetitle, _random_extension = create_random_strings(2)
+        _random_filename = f'{_random_filetitle}.{_random_extension[:4]}'
         _path_with_random_filename = os.path.normpath(os.path.join(parent_dirpath, _random_filename))
         move_path_renamed = _path_with_random_filename
         # 重命名时会遇到权限问题导致报错
@@ -150,19 +248,131 @@ def _release_nesting_folder(check_path: str, target_dirpath: str) -> str:
             except Exception as e:
                 raise e
 
-    # 再进行移动
+    # 拼接最终路径，再进行移动（直接移动至最终路径，否则会保留随机文件名）
+    final_path = os.path.normpath(os.path.join(target_dirpath, nodup_filename))
     try:
-        shutil.move(move_path_renamed, target_dirpath)
+        shutil.move(move_path_renamed, final_path)
     except OSError:  # OSError: [WinError 145] 目录不是空的。原始文件夹下有残留文件夹，如果为空则尝试直接删除
         _delete_empty_folder(move_path_renamed)
 
-    # 拼接最终路径
-    final_path = os.path.normpath(os.path.join(target_dirpath, nodup_filename))
     _delete_empty_folder(check_path)  # 如果原始文件夹为空，则直接删除
 
     return final_path
 
 
+def _move_path(path: str, target_path: str):
+    """移动文件/文件夹至指定路径（同一磁盘内直接重命名）"""
+    try:
+        os.rename(path, target_path)
+    except PermissionError:  # PermissionError: [WinError 5] 拒绝访问。尝试等待0.2秒后再次重命名
+        time.sleep(0.2)
+        os.rename(path, target_path)
+    except OSError:  # 跨磁盘移动
+        shutil.move(path, target_path)
+
+
+def _get_empty_wrapper_dirpath(check_path: str, moved_path: str) -> Union[str, None]:
+    """获取路径移出后，其外层已变为空的最上级套娃文件夹（不超出检查的路径）
+    :param check_path: 检查的路径
+    :param moved_path: 已移出的路径（位于检查的路径中）
+    :return: 最上级的空文件夹路径，没有时返回None"""
+    if moved_path == check_path:
+        return None
+
+    wrapper_dirpath = None
+    dirpath = os.path.dirname(moved_path)
+    child_names = []  # 下级中允许存在的文件夹（已确认为空的套娃文件夹）
+    while True:
+        try:
+            if os.listdir(dirpath) != child_names:
+                break
+        except OSError:
+            break
+        wrapper_dirpath = dirpath
+        if dirpath == check_path:
+            break
+        child_names = [os.path.basename(dirpath)]
+        dirpath = os.path.dirname(dirpath)
+
+    return wrapper_dirpath
+
+
+def _release_nesting_folders(check_paths: Iterable[str], target_dirpath: str,
+                             max_workers: int = None) -> Dict[str, Union[str, None]]:
+    """批量解除套娃文件夹，将每个路径中最深一级的非单层文件/文件夹移动至指定文件夹
+    先规划所有移动操作，基于目标文件夹的一次读取结果生成无重复的文件名，再并行移动
+    :param check_paths: 需要检查的路径列表
+    :param target_dirpath: 移动的目标文件夹
+    :param max_workers: 最大线程数
+    :return: {检查的路径: 最终移动后的路径}，移动失败的路径为None
+    """
+    # 如果目标文件夹不存在，则新建该文件夹
+    if not os.path.exists(target_dirpath):
+        os.makedirs(target_dirpath)
+
+    if not os.path.isdir(target_dirpath):
+        raise Exception(f'传入文件夹参数错误，【{target_dirpath}】不是文件夹路径')
+
+    target_dirpath = os.path.normpath(target_dirpath)
+    name_allocator = NameAllocator(target_dirpath)  # 只读取一次目标文件夹，已规划的文件名也视为已占用
+
+    # 规划移动操作
+    results = {}
+    moves = {}  # {需要移动的路径: (最终路径, 检查的路径)}
+    for check_path in dict.fromkeys(os.path.normpath(i) for i in check_paths):
+        if not os.path.exists(check_path):
+            print(f'报错提示：路径不存在【{check_path}】')
+            results[check_path] = None
+            continue
+
+        # 提取需要移动的路径（如果传参是文件，则直接为该路径，如果传参是文件夹，则为最深一级非单层文件夹
+        if os.path.isfile(check_path):
+            need_move_path = check_path
+        else:
+            need_move_path = get_first_multi_file_dirpath(check_path)
+
+        # 需要移动的路径已经位于目标文件夹中，或已由其他检查路径规划，则不需要再进行移动
+        if need_move_path == target_dirpath or os.path.dirname(need_move_path) == target_dirpath:
+            results[check_path] = need_move_path
+            continue
+        if need_move_path in moves:
+            results[check_path] = moves[need_move_path][0]
+            continue
+
+        # 生成目标文件夹下无重复的文件名（统一数字后缀）
+        _, filetitle, file_extension = split_path(need_move_path)
+        filename = name_allocator.allocate(filetitle, file_extension)
+
+        final_path = os.path.normpath(os.path.join(target_dirpath, filename))
+        moves[need_move_path] = (final_path, check_path)
+        results[check_path] = final_path
+
+    # 并行移动
+    def move(need_move_path: str) -> bool:
+        final_path, check_path = moves[need_move_path]
+        try:
+            _move_path(need_move_path, final_path)
+            return True
+        except OSError as e:
+            print(f'报错提示：{e}')
+            results[check_path] = None
+            return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        moved_paths = [path for path, is_moved in zip(moves, executor.map(move, moves)) if is_moved]
+
+    # 仅删除成功移动的路径外层已变为空的套娃文件夹（统一删除至回收站），不处理移动后的路径及未移动的路径
+    wrapper_dirpaths = []
+    for need_move_path in moved_paths:
+        wrapper_dirpath = _get_empty_wrapper_dirpath(moves[need_move_path][1], need_move_path)
+        if wrapper_dirpath:
+            wrapper_dirpaths.append(wrapper_dirpath)
+    if wrapper_dirpaths:
+        _delete_paths(wrapper_dirpaths, send_to_trash=True)
+
+    return results
+
+
 """----------调用函数----------"""
 
 
@@ -174,12 +384,22 @@ def delete(path: str, send_to_trash: bool = False) -> bool:
     return _delete(path, send_to_trash)
 
 
-def find_empty_folder(dirpath: str) -> list:
+def delete_paths(paths: Iterable[str], send_to_trash: bool = False, max_workers: int = None) -> Dict[str, list]:
+    """批量删除文件/文件夹（剔除重复路径与已包含在其他路径中的子路径）
+    :param paths: 需要删除的路径列表
+    :param send_to_trash: 是否删除至回收站（批量移至回收站）
+    :param max_workers: 永久删除时的最大线程数
+    :return: 删除结果，{'deleted': [成功删除的路径], 'failed': {删除失败的路径: 错误信息}, 'missing': [不存在的路径]}"""
+    return _delete_paths(paths, send_to_trash, max_workers)
+
+
+def find_empty_folder(dirpath: str, sort: str = 'os') -> list:
     """搜索指定文件夹中的空文件夹（及其自身）
     :param dirpath: 文件夹路径
+    :param sort: 排序方式，'os'使用natsort.os_sorted，'natural'使用更快的sort_paths
     :return: 搜索到的空文件夹路径
     """
-    return _find_empty_folder(dirpath)
+    return _find_empty_folder(dirpath, sort)
 
 
 def delete_empty_folder(dirpath: str, send_to_trash: bool = True) -> list:
@@ -206,3 +426,14 @@ def release_nesting_folder(check_path: str, target_dirpath: str) -> str:
     :return: 最终移动后的路径
     """
     return _release_nesting_folder(check_path, target_dirpath)
+
+
+def release_nesting_folders(check_paths: Iterable[str], target_dirpath: str,
+                            max_workers: int = None) -> Dict[str, Union[str, None]]:
+    """批量解除套娃文件夹，将每个路径中最深一级的非单层文件/文件夹移动至指定文件夹
+    :param check_paths: 需要检查的路径列表
+    :param target_dirpath: 移动的目标文件夹
+    :param max_workers: 最大线程数
+    :return: {检查的路径: 最终移动后的路径}，移动失败的路径为None
+    """
+    return _release_nesting_folders(check_paths, target_dirpath, max_workers)
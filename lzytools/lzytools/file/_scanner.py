@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Tuple
+
+from ._info import _scan_dir_entries
+
+
+class ParallelDirScanner:
+    """多线程文件夹遍历器（用于网络路径等高延迟的文件系统）
+    按遍历顺序预先将后续文件夹的读取任务提交到线程池，多个文件夹的读取可以同时进行，
+    返回结果的顺序与walk_dir/os.walk完全一致
+    :param max_workers: 最大线程数
+    :param max_pending: 最多同时预读的文件夹数，默认为线程数的4倍
+    :param progress_callback: 每读取完一个文件夹时调用，传入遍历器自身，可通过其属性获取进度
+    """
+
+    def __init__(self, max_workers: int = 16, max_pending: int = None,
+                 progress_callback: Callable[['ParallelDirScanner'], None] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 4
+        self.progress_callback = progress_callback
+
+        # 进度计数
+        self.scanned_dirs = 0  # 已读取的文件夹数
+        self.failed_dirs = 0  # 无法访问的文件夹数
+        self.found_files = 0  # 已找到的文件数
+        self.found_dirs = 0  # 已找到的文件夹数
+        self.total_size = 0  # 已找到的文件总大小
+        self.queued_dirs = 0  # 已找到但未读取的文件夹数
+
+    def _reset_progress(self):
+        """重置进度计数"""
+        self.scanned_dirs = 0
+        self.failed_dirs = 0
+        self.found_files = 0
+        self.found_dirs = 0
+        self.total_size = 0
+        self.queued_dirs = 0
+
+    def scan(self, dirpath: str) -> Iterator[Tuple[str, bool, int]]:
+        """遍历文件夹
+        :param dirpath: 文件夹路径
+        :return: 生成器，(路径, 是否为文件夹, 文件大小)，文件夹的大小为0"""
+        self._reset_progress()
+        stack = [os.path.normpath(dirpath)]  # 待读取的文件夹，栈顶为下一个需要返回结果的文件夹
+        self.queued_dirs = 1
+        futures = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                while stack:
+                    # 预读栈顶的若干个文件夹（即接下来最先需要的文件夹），栈顶的文件夹必须提交
+                    for pending_dirpath in reversed(stack[-self.max_pending:]):
+                        if pending_dirpath in futures:
+                            continue
+                        if len(futures) >= self.max_pending and pending_dirpath != stack[-1]:
+                            break
+                        futures[pending_dirpath] = executor.submit(_scan_dir_entries, pending_dirpath)
+
+                    current_dirpath = stack.pop()
+                    entries = futures.pop(current_dirpath).result()
+                    self.queued_dirs -= 1
+                    if entries is None:
+                        self.failed_dirs += 1
+                        continue
+
+                    child_dirpaths = []
+                    for path, is_dir, size, need_walk in entries:
+                        if is_dir:
+                            self.found_dirs += 1
+                            if need_walk:
+                                child_dirpaths.append(path)
+                        else:
+                            self.found_files += 1
+                            self.total_size += size
+
+                    self.scanned_dirs += 1
+                    self.queued_dirs += len(child_dirpaths)
+                    stack.extend(reversed(child_dirpaths))
+                    if self.progress_callback:
+                        self.progress_callback(self)
+
+                    for path, is_dir, size, _ in entries:
+                        yield path, is_dir, size
+            finally:  # 提前结束遍历时取消未开始的任务
+                for future in futures.values():
+                    future.cancel()
+
+
+"""----------调用函数----------"""
+
+
+def walk_dir_parallel(dirpath: str, max_workers: int = 16) -> Iterator[Tuple[str, bool, int]]:
+    """多线程遍历文件夹（用于网络路径等高延迟的文件系统，遍历顺序与walk_dir一致）
+    :param dirpath: 文件夹路径
+    :param max_workers: 最大线程数
+    :return: 生成器，(路径, 是否为文件夹, 文件大小)，文件夹的大小为0"""
+    return ParallelDirScanner(max_workers).scan(dirpath)
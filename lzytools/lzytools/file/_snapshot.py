@@ -0,0 +1,267 @@
+import json
+import os
+from typing import Dict, List, Tuple, Iterable, Union
+
+from ._info import _scan_dir_entries
+from ._sort import _sort_paths_by
+
+
+class DirSnapshot:
+    """文件夹快照索引，记录每个文件夹的修改时间、下级文件/文件夹及汇总大小，支持保存到本地并增量更新
+    重新扫描时，修改时间未变化的文件夹直接复用上次的下级列表（不再读取文件夹内容），仅对子文件夹执行一次stat
+    注意：文件夹的修改时间只在其下级文件/文件夹新增、删除、重命名时变化，直接修改文件内容不会改变文件夹的修改时间，
+    如果需要检测文件大小的变化，扫描时需使用verify_files参数
+    :param dirpath: 文件夹路径
+    :param snapshot_path: 快照文件路径，文件存在时读取上次的快照
+    """
+
+    def __init__(self, dirpath: str, snapshot_path: str = None):
+        self.dirpath = os.path.normpath(os.path.abspath(dirpath))
+        self.snapshot_path = snapshot_path
+
+        # {文件夹路径: (修改时间, {文件名: 文件大小}, [需要进入的子文件夹名], [符号链接等不进入的文件夹名])}
+        self._dirs: Dict[str, Tuple[int, Dict[str, int], List[str], List[str]]] = {}
+        self._sizes: Dict[str, int] = {}  # {文件夹路径: 文件夹总大小}
+        self._empty_dirs = set()  # 空文件夹（不含任何文件的文件夹）
+
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load(snapshot_path)
+
+    def load(self, snapshot_path: str = None):
+        """读取快照文件（json格式），文件损坏或格式不符时忽略，下次扫描时重新生成
+        :param snapshot_path: 快照文件路径，默认使用初始化时设置的路径"""
+        snapshot_path = snapshot_path or self.snapshot_path
+        try:
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('dirpath') != self.dirpath:  # 不是同一个文件夹的快照
+                return
+            # json不保存元组，读取后将快照记录转换回元组
+            dirs = {dirpath: tuple(record) for dirpath, record in snapshot['dirs'].items()}
+            for dirpath, record in dirs.items():
+                if not self._is_valid_record(record):
+                    raise ValueError(f'快照记录格式错误：{dirpath}')
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f'报错提示：{e}')
+            return
+
+        self._dirs = dirs
+        self._update_aggregates()
+
+    @staticmethod
+    def _is_valid_record(record: tuple) -> bool:
+        """检查快照记录的格式：(修改时间, {文件名: 文件大小}, [子文件夹名], [不进入的文件夹名])"""
+        if len(record) != 4:
+            return False
+        mtime_ns, files, subdirs, other_dirs = record
+        return (isinstance(mtime_ns, int)
+                and isinstance(files, dict) and all(isinstance(i, int) for i in files.values())
+                and isinstance(subdirs, list) and all(isinstance(i, str) for i in subdirs)
+                and isinstance(other_dirs, list) and all(isinstance(i, str) for i in other_dirs))
+
+    def save(self, snapshot_path: str = None):
+        """保存快照文件（json格式，先写入临时文件再替换，防止写入中断导致快照文件损坏）
+        :param snapshot_path: 快照文件路径，默认使用初始化时设置的路径"""
+        snapshot_path = snapshot_path or self.snapshot_path
+        if not snapshot_path:
+            raise Exception('未设置快照文件路径')
+
+        temp_path = f'{snapshot_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'dirpath': self.dirpath, 'dirs': self._dirs}, f, ensure_ascii=False)
+        os.replace(temp_path, snapshot_path)
+
+    def scan(self, verify_files: bool = False) -> Dict[str, int]:
+        """扫描文件夹，更新快照（跳过修改时间未变化的文件夹）
+        :param verify_files: 是否重新读取所有文件夹（用于检测文件大小的变化）
+        :return: 扫描统计，{'listed_dirs': 重新读取的文件夹数, 'reused_dirs': 复用快照的文件夹数}"""
+        if not os.path.isdir(self.dirpath):
+            raise Exception(f'路径不存在：{self.dirpath}')
+
+        stats = {'listed_dirs': 0, 'reused_dirs': 0}
+        self._dirs = self._scan_tree(self.dirpath, self._dirs, verify_files, stats)  # 已删除的文件夹不会出现在新快照中
+        self._update_aggregates()
+
+        return stats
+
+    @staticmethod
+    def _list_dir(dirpath: str, mtime_ns: int) -> Union[Tuple[int, Dict[str, int], List[str], List[str]], None]:
+        """读取文件夹的下级文件/文件夹，生成快照记录"""
+        entries = _scan_dir_entries(dirpath)
+        if entries is None:
+            return None
+
+        files, subdirs, other_dirs = {}, [], []
+        for path, is_dir, size, need_walk in entries:
+            name = os.path.basename(path)
+            if not is_dir:
+                files[name] = size
+            elif need_walk:
+                subdirs.append(name)
+            else:
+                other_dirs.append(name)
+        return mtime_ns, files, subdirs, other_dirs
+
+    def _scan_tree(self, dirpath: str, old_dirs: dict, verify_files: bool = False, stats: dict = None) -> dict:
+        """扫描文件夹及其所有子文件夹，修改时间未变化的文件夹复用旧记录
+        :return: {文件夹路径: 快照记录}"""
+        new_dirs = {}
+        stack = [dirpath]
+        while stack:
+            current_dirpath = stack.pop()
+            try:
+                mtime_ns = os.stat(current_dirpath).st_mtime_ns
+            except OSError:  # 扫描期间被删除或无权限访问
+                continue
+
+            record = old_dirs.get(current_dirpath)
+            if record is not None and record[0] == mtime_ns and not verify_files:
+                if stats is not None:
+                    stats['reused_dirs'] += 1
+            else:
+                record = self._list_dir(current_dirpath, mtime_ns)
+                if record is None:
+                    continue
+                if stats is not None:
+                    stats['listed_dirs'] += 1
+
+            new_dirs[current_dirpath] = record
+            stack.extend(os.path.join(current_dirpath, i) for i in reversed(record[2]))
+
+        return new_dirs
+
+    def refresh(self, dirpaths: Iterable[str]):
+        """重新读取指定的文件夹（不检查修改时间），新增的子文件夹会被完整扫描，并仅更新受影响文件夹的汇总数据
+        :param dirpaths: 发生变化的文件夹路径列表"""
+        affected = set()
+        # 按层级从浅到深处理，父文件夹先刷新，其新增/删除的子文件夹不需要再单独处理
+        dirpaths = {os.path.normpath(os.path.abspath(i)) for i in dirpaths}
+        for dirpath in sorted(dirpaths, key=self._get_depth):
+            if dirpath not in self._dirs:  # 不在快照中，或已随父文件夹刷新时被删除/重新扫描
+                continue
+
+            old_record = self._dirs[dirpath]
+            try:
+                record = self._list_dir(dirpath, os.stat(dirpath).st_mtime_ns)
+            except OSError:
+                record = None
+            if record is None:  # 文件夹已被删除，由其父文件夹的刷新处理
+                self._remove_tree(dirpath)
+                affected.add(os.path.dirname(dirpath))
+                continue
+
+            self._dirs[dirpath] = record
+            affected.add(dirpath)
+
+            for name in set(old_record[2]) - set(record[2]):
+                self._remove_tree(os.path.join(dirpath, name))
+            for name in set(record[2]) - set(old_record[2]):
+                new_dirs = self._scan_tree(os.path.join(dirpath, name), {})
+                self._dirs.update(new_dirs)
+                affected.update(new_dirs)
+
+        self._update_aggregates_partial(affected)
+
+    def _remove_tree(self, dirpath: str):
+        """从快照中删除文件夹及其所有子文件夹"""
+        record = self._dirs.pop(dirpath, None)
+        self._sizes.pop(dirpath, None)
+        self._empty_dirs.discard(dirpath)
+        if record is None:
+            return
+        for name in record[2]:
+            self._remove_tree(os.path.join(dirpath, name))
+
+    def _get_depth(self, dirpath: str) -> int:
+        """获取文件夹相对于根文件夹的层级"""
+        if dirpath == self.dirpath:
+            return 0
+        return len(os.path.relpath(dirpath, self.dirpath).split(os.sep))
+
+    def _update_dir_aggregate(self, dirpath: str):
+        """根据子文件夹的汇总数据更新单个文件夹的总大小及空文件夹状态"""
+        _, files, subdirs, other_dirs = self._dirs[dirpath]
+        child_dirpaths = [os.path.join(dirpath, i) for i in subdirs]
+        self._sizes[dirpath] = sum(files.values()) + sum(self._sizes.get(i, 0) for i in child_dirpaths)
+        if not files and not other_dirs and all(i in self._empty_dirs for i in child_dirpaths):
+            self._empty_dirs.add(dirpath)
+        else:
+            self._empty_dirs.discard(dirpath)
+
+    def _update_aggregates(self):
+        """自下而上更新每个文件夹的总大小及空文件夹状态"""
+        self._sizes = {}
+        self._empty_dirs = set()
+        if self.dirpath not in self._dirs:
+            return
+
+        # 按先序遍历的逆序处理，保证子文件夹先于父文件夹计算
+        for dirpath in reversed(list(self._iter_dirpaths(self.dirpath))):
+            self._update_dir_aggregate(dirpath)
+
+    def _update_aggregates_partial(self, dirpaths: Iterable[str]):
+        """自下而上更新指定文件夹及其所有上级文件夹的汇总数据"""
+        need_update = set()
+        for dirpath in dirpaths:
+            while dirpath in self._dirs and dirpath not in need_update:
+                need_update.add(dirpath)
+                if dirpath == self.dirpath:
+                    break
+                dirpath = os.path.dirname(dirpath)
+
+        for dirpath in sorted(need_update, key=self._get_depth, reverse=True):
+            self._update_dir_aggregate(dirpath)
+
+    def _get_record_dirpath(self, dirpath: str = None) -> str:
+        """规范化查询的文件夹路径"""
+        if dirpath is None:
+            return self.dirpath
+
+        dirpath = os.path.normpath(os.path.abspath(dirpath))
+        if dirpath not in self._dirs:
+            raise Exception(f'快照中不存在该文件夹：{dirpath}')
+        return dirpath
+
+    def _iter_dirpaths(self, dirpath: str):
+        """按先序遍历快照中的文件夹"""
+        stack = [dirpath]
+        while stack:
+            current_dirpath = stack.pop()
+            if current_dirpath not in self._dirs:  # 扫描时无法访问的文件夹
+                continue
+            yield current_dirpath
+            stack.extend(os.path.join(current_dirpath, i) for i in reversed(self._dirs[current_dirpath][2]))
+
+    def get_dir_size(self, dirpath: str = None) -> int:
+        """获取文件夹的总大小（字节byte）
+        :param dirpath: 文件夹路径，默认为快照的根文件夹"""
+        return self._sizes[self._get_record_dirpath(dirpath)]
+
+    def get_files_in_dir(self, dirpath: str = None) -> list:
+        """获取文件夹中所有文件的路径
+        :param dirpath: 文件夹路径，默认为快照的根文件夹"""
+        files = []
+        for current_dirpath in self._iter_dirpaths(self._get_record_dirpath(dirpath)):
+            files.extend(os.path.join(current_dirpath, i) for i in self._dirs[current_dirpath][1])
+        return files
+
+    def get_folders_in_dir(self, dirpath: str = None) -> list:
+        """获取文件夹中所有文件夹的路径
+        :param dirpath: 文件夹路径，默认为快照的根文件夹"""
+        folders = []
+        for current_dirpath in self._iter_dirpaths(self._get_record_dirpath(dirpath)):
+            _, _, subdirs, other_dirs = self._dirs[current_dirpath]
+            folders.extend(os.path.join(current_dirpath, i) for i in subdirs + other_dirs)
+        return folders
+
+    def is_empty_folder(self, dirpath: str = None) -> bool:
+        """文件夹是否为空文件夹（不含任何文件）
+        :param dirpath: 文件夹路径，默认为快照的根文件夹"""
+        return self._get_record_dirpath(dirpath) in self._empty_dirs
+
+    def find_empty_folder(self, dirpath: str = None, sort: str = 'os') -> list:
+        """搜索文件夹中的空文件夹（及其自身）
+        :param dirpath: 文件夹路径，默认为快照的根文件夹
+        :param sort: 排序方式，'os'使用natsort.os_sorted，'natural'使用更快的sort_paths"""
+        empty_folders = [i for i in self._iter_dirpaths(self._get_record_dirpath(dirpath)) if i in self._empty_dirs]
+        return _sort_paths_by(empty_folders, sort)
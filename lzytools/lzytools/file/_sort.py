@@ -0,0 +1,206 @@
+import functools
+import heapq
+import locale
+import os
+import re
+from typing import Iterable, List
+
+import natsort
+
+# 排序键使用字符串，排序时直接比较字符串，不需要逐项比较元组：
+# 层级分隔符替换为\x00（父路径排在其所有子路径之前），文件扩展名分隔符替换为\x01（文件名相同时不含扩展名的排在前面），
+# 连续数字去除前导0后编码为 \x02 + 数字位数 + 数字（位数少的数值更小，位数相同时按字符串比较即为按数值比较）
+_DIGIT_PATTERN = re.compile(r'(\d+)')
+_LEVEL_SEPARATOR = '\x00'
+_EXTENSION_SEPARATOR = '\x01'
+_NUMBER_PREFIX = '\x02'
+_TIE_SEPARATOR = '\x00\x00'  # 排序键相同时（例如仅大小写不同），按原始字符串排序
+
+# 缓存的键数量（文件夹的键及文件夹名的键，同一文件夹下的路径共用上级文件夹的键）
+_KEY_CACHE_SIZE = 65536
+
+# use_locale=True时按当前的LC_COLLATE规则比较文本，本模块不调用locale.setlocale（会修改整个进程的状态且非线程安全），
+# 需要由调用方在排序前自行设置，例如locale.setlocale(locale.LC_COLLATE, '')；修改后需调用clear_sort_key_cache清空缓存的键
+# 与natsort.os_sorted的排序结果不完全一致（例如前导0、大小写相同的路径的先后顺序），因此已有函数默认仍使用os_sorted，
+# 通过sort='natural'参数选择使用本模块（常见路径下顺序一致，约快15倍）
+# 注意：未达到100万路径1秒内排序的目标，单核测试环境中20万路径约1.1秒（100万路径约5.6秒），
+# 主要耗时为逐个生成排序键，普通的sorted()排序相同数量的字符串约需1秒
+
+"""----------逻辑函数----------"""
+
+
+@functools.lru_cache(maxsize=_KEY_CACHE_SIZE)
+def _encode_number(digits: str) -> str:
+    """编码连续数字，使其按字符串比较的结果与按数值比较一致"""
+    number = digits.lstrip('0') or '0'
+    return f'{_NUMBER_PREFIX}{chr(0x30 + len(number))}{number}'
+
+
+def _natural_key(text: str) -> str:
+    """生成自然排序键（忽略大小写，连续数字按数值比较）"""
+    parts = _DIGIT_PATTERN.split(text.casefold())
+    if len(parts) == 1:
+        return parts[0]
+    parts[1::2] = map(_encode_number, parts[1::2])
+    return ''.join(parts)
+
+
+def _locale_key(text: str) -> str:
+    """生成本地环境的自然排序键（文本部分按本地环境的排序规则比较，例如中文按拼音排序）"""
+    parts = _DIGIT_PATTERN.split(text.casefold())
+    parts[::2] = map(locale.strxfrm, parts[::2])
+    parts[1::2] = map(_encode_number, parts[1::2])
+    return ''.join(parts)
+
+
+def _create_name_key(key_func):
+    """生成单层文件名/文件夹名的排序键函数（文件名与扩展名分开比较）"""
+
+    def name_key(name: str) -> str:
+        filetitle, _, extension = name.rpartition('.')
+        if not filetitle:  # 没有扩展名，或以.开头的文件名
+            return key_func(name)
+        return f'{key_func(filetitle)}{_EXTENSION_SEPARATOR}{key_func(extension)}'
+
+    return name_key
+
+
+class _PathKeyGenerator:
+    """路径排序键生成器，缓存文件夹的键，同一文件夹下的路径只需要计算最后一级的键"""
+
+    def __init__(self, key_func):
+        self._name_key = _create_name_key(key_func)
+        self._cached_name_key = functools.lru_cache(maxsize=_KEY_CACHE_SIZE)(self._name_key)
+        self._dir_key = functools.lru_cache(maxsize=_KEY_CACHE_SIZE)(self._get_dir_key)
+
+    def _get_dir_key(self, dirpath: str) -> str:
+        """生成文件夹的排序键（逐级使用上级文件夹的缓存）"""
+        if not dirpath:
+            return ''
+        parent_dirpath, sep, dirname = dirpath.rpartition(os.sep)
+        parent_key = self._dir_key(parent_dirpath) if sep else ''
+        return f'{parent_key}{_LEVEL_SEPARATOR}{self._cached_name_key(dirname)}'
+
+    def __call__(self, path: str) -> str:
+        key_path = path.replace(os.altsep, os.sep) if os.altsep else path
+        dirpath, _, name = key_path.rpartition(os.sep)
+        # 最后一级大多各不相同，不使用缓存
+        return f'{self._dir_key(dirpath)}{_LEVEL_SEPARATOR}{self._name_key(name)}{_TIE_SEPARATOR}{path}'
+
+    def cache_clear(self):
+        """清空缓存"""
+        self._cached_name_key.cache_clear()
+        self._dir_key.cache_clear()
+
+
+_PATH_KEY = _PathKeyGenerator(_natural_key)
+_LOCALE_PATH_KEY = _PathKeyGenerator(_locale_key)
+
+
+def _get_path_key_func(use_locale: bool) -> _PathKeyGenerator:
+    """获取路径排序键函数"""
+    return _LOCALE_PATH_KEY if use_locale else _PATH_KEY
+
+
+def _natural_sort_key(text: str, use_locale: bool = False) -> str:
+    """生成字符串的自然排序键（忽略大小写，连续数字按数值比较）
+    :param text: 字符串
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（需由调用方预先设置locale）
+    :return: 排序键"""
+    if use_locale:
+        return f'{_locale_key(text)}{_TIE_SEPARATOR}{text}'
+    return f'{_natural_key(text)}{_TIE_SEPARATOR}{text}'
+
+
+def _path_sort_key(path: str, use_locale: bool = False) -> str:
+    """生成路径的排序键（逐层自然排序，同一文件夹下的路径连续排列，文件名与扩展名分开比较）
+    :param path: 路径
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（需由调用方预先设置locale）
+    :return: 排序键"""
+    return _get_path_key_func(use_locale)(path)
+
+
+def _sort_paths(paths: Iterable[str], reverse: bool = False, use_locale: bool = False) -> List[str]:
+    """按自然顺序排序路径列表（与资源管理器的排序规则相近）
+    :param paths: 路径列表
+    :param reverse: 是否倒序
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（例如中文按拼音排序，需由调用方预先设置locale）
+    :return: 排序后的路径列表"""
+    return sorted(paths, key=_get_path_key_func(use_locale), reverse=reverse)
+
+
+def _sort_paths_by(paths: Iterable[str], sort: str = 'os') -> List[str]:
+    """按指定的排序方式排序路径列表（供已有函数的sort参数使用）
+    :param paths: 路径列表
+    :param sort: 'os'使用natsort.os_sorted（与资源管理器一致），'natural'使用本模块的排序键（更快）
+    :return: 排序后的路径列表"""
+    if sort == 'os':
+        return natsort.os_sorted(paths)
+    if sort == 'natural':
+        return _sort_paths(paths)
+    raise Exception(f'不支持的排序方式：{sort}')
+
+
+def _merge_sorted_paths(sorted_paths: Iterable[str], new_paths: Iterable[str],
+                        use_locale: bool = False) -> List[str]:
+    """将新路径合并到已排序的路径列表中（只排序新路径，再与已排序的列表归并）
+    :param sorted_paths: 已按相同规则排序的路径列表
+    :param new_paths: 需要添加的路径列表
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（需由调用方预先设置locale）
+    :return: 合并后的路径列表"""
+    key_func = _get_path_key_func(use_locale)
+    new_paths = sorted(new_paths, key=key_func)
+    if not new_paths:
+        return list(sorted_paths)
+
+    return list(heapq.merge(sorted_paths, new_paths, key=key_func))
+
+
+def _clear_sort_key_cache():
+    """清空排序键缓存"""
+    _encode_number.cache_clear()
+    _PATH_KEY.cache_clear()
+    _LOCALE_PATH_KEY.cache_clear()
+
+
+"""----------调用函数----------"""
+
+
+def natural_sort_key(text: str, use_locale: bool = False) -> str:
+    """生成字符串的自然排序键（忽略大小写，连续数字按数值比较），可用于sorted的key参数
+    :param text: 字符串
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（需由调用方预先设置locale）
+    :return: 排序键"""
+    return _natural_sort_key(text, use_locale)
+
+
+def path_sort_key(path: str, use_locale: bool = False) -> str:
+    """生成路径的排序键（逐层自然排序），可用于sorted的key参数
+    :param path: 路径
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（需由调用方预先设置locale）
+    :return: 排序键"""
+    return _path_sort_key(path, use_locale)
+
+
+def sort_paths(paths: Iterable[str], reverse: bool = False, use_locale: bool = False) -> List[str]:
+    """按自然顺序排序路径列表（与资源管理器的排序规则相近）
+    :param paths: 路径列表
+    :param reverse: 是否倒序
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（例如中文按拼音排序，需由调用方预先设置locale）
+    :return: 排序后的路径列表"""
+    return _sort_paths(paths, reverse, use_locale)
+
+
+def merge_sorted_paths(sorted_paths: Iterable[str], new_paths: Iterable[str],
+                       use_locale: bool = False) -> List[str]:
+    """将新路径合并到已排序的路径列表中（只排序新路径，再与已排序的列表归并）
+    :param sorted_paths: 已按相同规则排序的路径列表
+    :param new_paths: 需要添加的路径列表
+    :param use_locale: 是否按当前LC_COLLATE的排序规则比较文本（需由调用方预先设置locale）
+    :return: 合并后的路径列表"""
+    return _merge_sorted_paths(sorted_paths, new_paths, use_locale)
+
+
+def clear_sort_key_cache():
+    """清空排序键缓存（修改LC_COLLATE后需调用）"""
+    _clear_sort_key_cache()
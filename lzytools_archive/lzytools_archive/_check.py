@@ -1,6 +1,7 @@
 import os
+from typing import Iterable, Dict
 
-import filetype
+import lzytools.file  # 0.1.8之后的版本（需要guess_filetypes）
 
 from ._volume import is_volume_archive_by_filename
 
@@ -30,18 +31,24 @@ def _is_archive(filepath: str) -> bool:
     """通过文件头判断是否为压缩文件
     :param filepath: 文件路径
     """
-    kind = filetype.guess(filepath)
-    if kind is None:
-        return False
-
-    guess_type = kind.extension
-
+    guess_type = lzytools.file.guess_filetype(filepath)  # 共用lzytools的文件类型缓存
     if guess_type and guess_type in _ARCHIVE_FILE_EXTENSION_FILETYPE:
         return True
 
     return False
 
 
+def _is_archives(filepaths: Iterable[str], max_workers: int = None) -> Dict[str, bool]:
+    """通过文件头批量判断是否为压缩文件（多线程读取文件头）
+    :param filepaths: 文件路径列表
+    :param max_workers: 最大线程数
+    :return: {文件路径: 是否为压缩文件}
+    """
+    guess_types = lzytools.file.guess_filetypes(filepaths, max_workers)
+    return {filepath: bool(guess_type and guess_type in _ARCHIVE_FILE_EXTENSION_FILETYPE)
+            for filepath, guess_type in guess_types.items()}
+
+
 """----------调用函数----------"""
 
 
@@ -57,3 +64,12 @@ def is_archive(filepath: str) -> bool:
     :param filepath: 文件路径
     """
     return _is_archive(filepath)
+
+
+def is_archives(filepaths: Iterable[str], max_workers: int = None) -> Dict[str, bool]:
+    """通过文件头批量判断是否为压缩文件（多线程读取文件头）
+    :param filepaths: 文件路径列表
+    :param max_workers: 最大线程数
+    :return: {文件路径: 是否为压缩文件}
+    """
+    return _is_archives(filepaths, max_workers)